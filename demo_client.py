@@ -4,22 +4,190 @@ Demo client for testing the autonomous agent.
 Run this after starting the server with: python -m agent.main
 """
 
+import argparse
 import asyncio
 import websockets
+from websockets.extensions.permessage_deflate import (
+    ClientPerMessageDeflateFactory,
+    PerMessageDeflate,
+)
+from websockets.frames import CONT
 import json
 import sys
+import time
+from typing import Optional
 
+try:
+    import orjson
 
-async def run_demo():
+    loads = orjson.loads
+
+    def dumps(obj) -> str:
+        # The server reads text frames, so hand websockets a str rather than
+        # the bytes orjson produces (bytes would go out as a binary frame).
+        return orjson.dumps(obj).decode()
+except ImportError:
+    loads = json.loads
+    dumps = json.dumps
+
+try:
+    # With msgpack installed, ask the server for binary frames
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Streamed text is written to stdout's buffer and flushed at most this often,
+# or once this many characters are pending, instead of once per token.
+FLUSH_INTERVAL = 0.016
+FLUSH_CHARS = 256
+
+# Messages smaller than this go out uncompressed; deflating a tiny chat or
+# reset frame costs more CPU than the bytes it saves.
+COMPRESSION_THRESHOLD = 128
+
+
+# The server sends compact JSON with "type" first, so a token frame starts
+# with this prefix followed by the content string literal.
+TEXT_DELTA_PREFIX = '{"type":"text_delta","content":"'
+
+
+def text_delta_content(frame: str) -> Optional[str]:
+    """
+    Extract the content of a text_delta frame without parsing the rest of it.
+    Returns None for any other frame, or when the content has escapes, and
+    callers then parse the frame in full.
+    """
+    if not frame.startswith(TEXT_DELTA_PREFIX):
+        return None
+    start = len(TEXT_DELTA_PREFIX)
+    end = frame.find('"', start)
+    if end < 0:
+        return None
+    body = frame[start:end]
+    if "\\" in body:
+        return None
+    return body
+
+
+# Binary frame opcodes (see agent/transport/framing.py)
+OP_MESSAGE = 0x00
+OP_TEXT_DELTA = 0x01
+
+
+def decode_frame(frame) -> dict:
+    """Decode a JSON text frame or an opcode-prefixed binary frame."""
+    if isinstance(frame, str):
+        return loads(frame)
+    if frame[0] == OP_TEXT_DELTA:
+        return {"type": "text_delta", "content": frame[1:].decode()}
+    return msgpack.unpackb(frame[1:], raw=False)
+
+
+class ThresholdPerMessageDeflate(PerMessageDeflate):
+    """permessage-deflate that skips compression for small single-frame messages."""
+    
+    def encode(self, frame):
+        if frame.fin and frame.opcode is not CONT and len(frame.data) < COMPRESSION_THRESHOLD:
+            return frame
+        return super().encode(frame)
+
+
+class ThresholdDeflateFactory(ClientPerMessageDeflateFactory):
+    """Negotiates permessage-deflate and installs ThresholdPerMessageDeflate."""
+    
+    def process_response_params(self, params, accepted_extensions):
+        ext = super().process_response_params(params, accepted_extensions)
+        return ThresholdPerMessageDeflate(
+            ext.remote_no_context_takeover,
+            ext.local_no_context_takeover,
+            ext.remote_max_window_bits,
+            ext.local_max_window_bits,
+            ext.compress_settings,
+        )
+
+
+def compression_extensions() -> list:
+    """Bounded-memory deflate: 4KB windows, no client context takeover."""
+    return [
+        ThresholdDeflateFactory(
+            client_no_context_takeover=True,
+            client_max_window_bits=12,
+            server_max_window_bits=12,
+            compress_settings={"memLevel": 5},
+        )
+    ]
+
+
+async def run_test(ws, test_name: str, message: str) -> str:
+    """Send one chat message and print the streamed response until it completes."""
+    print(f"\n{'='*60}")
+    print(f"TEST: {test_name}")
+    print(f"USER: {message}")
+    print(f"{'='*60}")
+    
+    # Send message
+    await ws.send(dumps({"type": "chat", "content": message}))
+    
+    # Collect streaming response
+    parts: list[str] = []
+    pending = 0
+    last_flush = time.monotonic()
+    while True:
+        response = await ws.recv()
+        content = text_delta_content(response) if isinstance(response, str) else None
+        if content is None:
+            data = decode_frame(response)
+            if data["type"] == "text_delta":
+                content = data.get("content") or ""
+        
+        if content is not None:
+            parts.append(content)
+            sys.stdout.write(content)
+            pending += len(content)
+            now = time.monotonic()
+            if pending >= FLUSH_CHARS or now - last_flush >= FLUSH_INTERVAL:
+                sys.stdout.flush()
+                pending = 0
+                last_flush = now
+            continue
+        
+        # Show any buffered text before printing other events
+        if pending:
+            sys.stdout.flush()
+            pending = 0
+        
+        if data["type"] == "tool_start":
+            print(f"\n  [🔧 Calling tool: {data['data']['tool_name']}]")
+        elif data["type"] == "tool_result":
+            status = "✓" if data["data"]["success"] else "✗"
+            print(f"  [{status} Tool result: {data['data']['tool_name']}]")
+        elif data["type"] == "complete":
+            print(f"\n\n✅ Completed in {data['data'].get('iterations', '?')} iterations")
+            break
+        elif data["type"] == "error":
+            print(f"\n❌ Error: {data.get('content')}")
+            break
+        elif data["type"] == "max_iterations":
+            print(f"\n⚠️ Max iterations reached")
+            break
+    
+    return "".join(parts)
+
+
+async def run_demo(slow: bool = False):
     uri = "ws://localhost:8000/chat"
+    if msgpack is not None:
+        uri += "?encoding=msgpack"
     
     print("🔌 Connecting to agent server...")
     
     try:
-        async with websockets.connect(uri) as ws:
+        async with websockets.connect(
+            uri, compression=None, extensions=compression_extensions()
+        ) as ws:
             # Wait for connection confirmation
             response = await ws.recv()
-            data = json.loads(response)
+            data = decode_frame(response)
             print(f"✅ Connected: {data.get('data', {}).get('client_id', 'unknown')}\n")
             
             # Demo conversations
@@ -33,48 +201,23 @@ async def run_demo():
                 ("Combined", "What time is it, and what's 15% of 250?"),
             ]
             
+            # Tests share one conversation on the server, so they run in
+            # order, back to back on the same connection.
             for test_name, message in tests:
-                print(f"\n{'='*60}")
-                print(f"TEST: {test_name}")
-                print(f"USER: {message}")
-                print(f"{'='*60}")
-                
-                # Send message
-                await ws.send(json.dumps({"type": "chat", "content": message}))
-                
-                # Collect streaming response
-                full_response = ""
-                while True:
-                    response = await ws.recv()
-                    data = json.loads(response)
-                    
-                    if data["type"] == "text_delta":
-                        print(data.get("content", ""), end="", flush=True)
-                        full_response += data.get("content", "")
-                    elif data["type"] == "tool_start":
-                        print(f"\n  [🔧 Calling tool: {data['data']['tool_name']}]")
-                    elif data["type"] == "tool_result":
-                        status = "✓" if data["data"]["success"] else "✗"
-                        print(f"  [{status} Tool result: {data['data']['tool_name']}]")
-                    elif data["type"] == "complete":
-                        print(f"\n\n✅ Completed in {data['data'].get('iterations', '?')} iterations")
-                        break
-                    elif data["type"] == "error":
-                        print(f"\n❌ Error: {data.get('content')}")
-                        break
-                    elif data["type"] == "max_iterations":
-                        print(f"\n⚠️ Max iterations reached")
-                        break
+                await run_test(ws, test_name, message)
                 
-                # Small delay between tests
-                await asyncio.sleep(1)
+                # Optional pause between tests, for following along live
+                if slow:
+                    await asyncio.sleep(1)
             
             # Test reset
             print(f"\n{'='*60}")
             print("TEST: Conversation Reset")
             print(f"{'='*60}")
-            await ws.send(json.dumps({"type": "reset"}))
+            await ws.send(dumps({"type": "reset"}))
             response = await ws.recv()
+            if isinstance(response, bytes):
+                response = decode_frame(response)
             print(f"Reset response: {response}")
             
             print("\n\n🎉 DEMO COMPLETE!")
@@ -88,4 +231,7 @@ async def run_demo():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_demo())
+    parser = argparse.ArgumentParser(description="Demo client for the agent server")
+    parser.add_argument("--slow", action="store_true", help="Pause one second between tests")
+    args = parser.parse_args()
+    asyncio.run(run_demo(slow=args.slow))
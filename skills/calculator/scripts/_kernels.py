@@ -0,0 +1,44 @@
+"""
+Numba-compiled statistics kernels for the calculator's array command.
+
+calc.py imports this module lazily, only for large arrays and only when
+CALC_JIT=1 is set: importing numba costs far more than the arithmetic on
+small inputs. Compiled machine code is cached in __pycache__ next to this
+file (cache=True), so only the first run after a change pays for JIT
+compilation.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def mean(arr):
+    """Arithmetic mean of a float64 array."""
+    total = 0.0
+    for x in arr:
+        total += x
+    return total / arr.size
+
+
+@njit(cache=True, fastmath=True)
+def variance(arr):
+    """Population variance (two-pass for accuracy)."""
+    m = mean(arr)
+    acc = 0.0
+    for x in arr:
+        d = x - m
+        acc += d * d
+    return acc / arr.size
+
+
+@njit(cache=True, fastmath=True)
+def stdev(arr):
+    """Population standard deviation."""
+    return np.sqrt(variance(arr))
+
+
+@njit(cache=True)
+def median(arr):
+    """Median via numba's partition-based np.median."""
+    return np.median(arr)
@@ -10,14 +10,36 @@ A comprehensive calculator supporting:
 - Unit conversions
 
 Usage: python3 calc.py <subcommand> [args]
+
+In-process callers can use run(argv), which returns the output dict
+instead of printing it and exiting.
 """
 
 import argparse
+import ast
+import functools
+import importlib.util
 import json
 import math
+import os
+import string
 import sys
-import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NoReturn, Optional
+
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    # catch the same exception either way.
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+
+class CalcError(Exception):
+    """Raised by subcommands to return an error result."""
+    
+    def __init__(self, message: str, **extra):
+        super().__init__(message)
+        self.data = {"error": message, **extra}
 
 
 def output(data: Dict[str, Any]) -> None:
@@ -26,9 +48,9 @@ def output(data: Dict[str, Any]) -> None:
     sys.exit(0 if "error" not in data else 1)
 
 
-def error(message: str, **extra) -> None:
-    """Print error and exit."""
-    output({"error": message, **extra})
+def error(message: str, **extra) -> NoReturn:
+    """Abort the current subcommand with an error result."""
+    raise CalcError(message, **extra)
 
 
 # ============================================
@@ -49,7 +71,7 @@ BASIC_OPERATIONS = {
 }
 
 
-def calc_command(args):
+def calc_command(args) -> Dict[str, Any]:
     """Handle basic calculation subcommand."""
     operation = args.operation.lower()
     
@@ -88,14 +110,14 @@ def calc_command(args):
     if b is not None:
         response["b"] = b
     
-    output(response)
+    return response
 
 
 # ============================================
 # Percentage Calculations
 # ============================================
 
-def percent_command(args):
+def percent_command(args) -> Dict[str, Any]:
     """Handle percentage calculation subcommand."""
     try:
         value = float(args.value)
@@ -109,11 +131,11 @@ def percent_command(args):
     
     result = (value * percent) / 100
     
-    output({
+    return {
         "value": value,
         "percent": percent,
         "result": result
-    })
+    }
 
 
 # ============================================
@@ -152,32 +174,75 @@ SAFE_CONSTANTS = {
 }
 
 
+# Base evaluation namespace; per-call variables are layered on top
+_EVAL_NAMESPACE = {
+    "__builtins__": {},  # No builtins
+    **SAFE_FUNCTIONS,
+    **SAFE_CONSTANTS,
+}
+
+# Syntax allowed in expressions: arithmetic on numbers, names and function calls
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Tuple,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Pow,
+    ast.UAdd, ast.USub,
+)
+
+
+def _validate_ast(tree: ast.AST) -> None:
+    """Reject any syntax outside the arithmetic subset (attributes, subscripts, ...)."""
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError("Only numeric literals are allowed in expressions")
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            raise ValueError("Only named functions can be called in expressions")
+
+
+# Allowed expression characters: numbers, operators, parentheses, function
+# names, variable names. Translating with this table deletes every allowed
+# character, so anything left over is invalid.
+_ALLOWED_CHARS = string.digits + string.ascii_letters + string.whitespace + "_+-*/.(),"
+_REJECT_ALLOWED = str.maketrans("", "", _ALLOWED_CHARS)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_expr(expression: str):
+    """
+    Validate and compile an expression.
+    Cached so repeated expressions skip parsing and compilation.
+    """
+    # Validate expression (basic security check)
+    if not expression or expression.translate(_REJECT_ALLOWED):
+        raise ValueError("Invalid characters in expression")
+    
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Evaluation error: {str(e)}")
+    
+    _validate_ast(tree)
+    return compile(tree, "<expr>", "eval")
+
+
 def safe_eval(expression: str, variables: Dict[str, float]) -> float:
     """
     Safely evaluate a mathematical expression.
     Only allows specific functions and variables.
     """
-    # Create safe namespace
-    namespace = {
-        "__builtins__": {},  # No builtins
-        **SAFE_FUNCTIONS,
-        **SAFE_CONSTANTS,
-        **variables,
-    }
-    
-    # Validate expression (basic security check)
-    # Allow: numbers, operators, parentheses, function names, variable names
-    if not re.match(r'^[\d\s\+\-\*/\.\(\)\,a-zA-Z_]+$', expression):
-        raise ValueError("Invalid characters in expression")
+    code = _compile_expr(expression)
+    namespace = {**_EVAL_NAMESPACE, **variables}
     
     try:
-        result = eval(expression, namespace)
+        result = eval(code, namespace)
         return float(result)
     except Exception as e:
         raise ValueError(f"Evaluation error: {str(e)}")
 
 
-def expr_command(args):
+def expr_command(args) -> Dict[str, Any]:
     """Handle expression evaluation subcommand."""
     expression = args.expression
     
@@ -195,11 +260,11 @@ def expr_command(args):
     
     try:
         result = safe_eval(expression, variables)
-        output({
+        return {
             "expression": expression,
             "variables": variables,
             "result": result
-        })
+        }
     except ValueError as e:
         error(str(e))
 
@@ -208,20 +273,89 @@ def expr_command(args):
 # Array/Statistical Operations
 # ============================================
 
+def _median(data: List[float]) -> float:
+    """Median with a single sort."""
+    s = sorted(data)
+    mid = len(s) // 2
+    return s[mid] if len(s) % 2 else (s[mid - 1] + s[mid]) / 2
+
+
+def _variance(data: List[float]) -> float:
+    """Population variance in one pass (Welford's algorithm)."""
+    mean = 0.0
+    m2 = 0.0
+    for i, x in enumerate(data, 1):
+        delta = x - mean
+        mean += delta / i
+        m2 += delta * (x - mean)
+    return m2 / len(data)
+
+
+def _stdev(data: List[float]) -> float:
+    """Population standard deviation."""
+    return math.sqrt(_variance(data))
+
+
 ARRAY_OPERATIONS = {
-    "sum": lambda data: sum(data),
+    "sum": sum,
     "mean": lambda data: sum(data) / len(data),
-    "median": lambda data: sorted(data)[len(data) // 2] if len(data) % 2 else 
-                           (sorted(data)[len(data) // 2 - 1] + sorted(data)[len(data) // 2]) / 2,
-    "min": lambda data: min(data),
-    "max": lambda data: max(data),
+    "median": _median,
+    "min": min,
+    "max": max,
     "range": lambda data: max(data) - min(data),
-    "variance": lambda data: sum((x - sum(data) / len(data)) ** 2 for x in data) / len(data),
-    "stdev": lambda data: math.sqrt(sum((x - sum(data) / len(data)) ** 2 for x in data) / len(data)),
+    "variance": _variance,
+    "stdev": _stdev,
+}
+
+# Arrays at least this long are reduced with NumPy when it is installed.
+# Below it, NumPy's import and per-call overhead outweighs the vectorized loop.
+NUMPY_THRESHOLD = 1024
+
+# Same operations over a contiguous float64 array, one C-level pass each
+NUMPY_ARRAY_OPERATIONS = {
+    "sum": lambda arr: arr.sum(),
+    "mean": lambda arr: arr.mean(),
+    "median": lambda arr: _numpy().median(arr),
+    "min": lambda arr: arr.min(),
+    "max": lambda arr: arr.max(),
+    "range": lambda arr: arr.max() - arr.min(),
+    "variance": lambda arr: arr.var(),
+    "stdev": lambda arr: arr.std(),
 }
 
 
-def array_command(args):
+# Operations with numba-compiled kernels in _kernels.py. Opt-in via CALC_JIT=1:
+# importing numba adds ~0.5s per process, which only pays off when the
+# calculator stays loaded across many large-array calls.
+JIT_OPERATIONS = frozenset({"mean", "median", "variance", "stdev"})
+JIT_ENABLED = os.environ.get("CALC_JIT") == "1"
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy on first use. Returns None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@functools.lru_cache(maxsize=None)
+def _jit_kernels():
+    """Load the numba kernels on first use. Returns None if numba is not installed."""
+    # Loaded by path: when run in-process this script's directory isn't on sys.path
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_kernels.py")
+    spec = importlib.util.spec_from_file_location("_calc_kernels", path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError:
+        return None
+    return module
+
+
+def array_command(args) -> Dict[str, Any]:
     """Handle array/statistical operations subcommand."""
     operation = args.operation.lower()
     
@@ -233,7 +367,7 @@ def array_command(args):
     
     # Parse JSON array
     try:
-        data = json.loads(args.data)
+        data = json_loads(args.data)
     except json.JSONDecodeError as e:
         error(f"Invalid JSON array: {e}")
     
@@ -243,18 +377,39 @@ def array_command(args):
     if len(data) == 0:
         error("Array cannot be empty")
     
+    np = _numpy() if len(data) >= NUMPY_THRESHOLD else None
+    
+    # Coerce to floats: NumPy's C cast for large arrays, a list
+    # comprehension otherwise. NumPy turns None into NaN, so reject it first.
     try:
-        data = [float(x) for x in data]
+        if np is not None:
+            if None in data:
+                raise TypeError("None is not a number")
+            arr = np.asarray(data, dtype=np.float64)
+            if arr.ndim != 1:
+                raise TypeError("nested arrays are not numbers")
+            data = arr.tolist()
+        else:
+            data = [float(x) for x in data]
     except (ValueError, TypeError):
         error("All array elements must be numbers")
     
     try:
-        result = ARRAY_OPERATIONS[operation](data)
-        output({
+        if np is not None:
+            use_jit = JIT_ENABLED and operation in JIT_OPERATIONS
+            kernels = _jit_kernels() if use_jit else None
+            if kernels is not None:
+                func = getattr(kernels, operation)
+            else:
+                func = NUMPY_ARRAY_OPERATIONS[operation]
+            result = float(func(arr))
+        else:
+            result = ARRAY_OPERATIONS[operation](data)
+        return {
             "operation": operation,
             "data": data,
             "result": result
-        })
+        }
     except Exception as e:
         error(f"Calculation error: {str(e)}")
 
@@ -301,6 +456,16 @@ UNIT_CONVERSIONS = {
     "k": ("temperature", None),
 }
 
+# Precomputed (from_unit, to_unit) -> multiplier for every same-dimension
+# pair with fixed factors, so a conversion is one lookup and one multiply.
+# Temperature has offsets and stays in convert_temperature().
+RATIO = {
+    (u1, u2): f1 / f2
+    for u1, (dim1, f1) in UNIT_CONVERSIONS.items()
+    for u2, (dim2, f2) in UNIT_CONVERSIONS.items()
+    if dim1 == dim2 and f1 is not None and f2 is not None
+}
+
 
 def convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
     """Convert between temperature units."""
@@ -325,53 +490,86 @@ def convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
         raise ValueError(f"Unknown temperature unit: {to_unit}")
 
 
-def convert_command(args):
+def convert_command(args) -> Dict[str, Any]:
     """Handle unit conversion subcommand."""
     try:
         value = float(args.value)
     except (ValueError, TypeError):
         error(f"Invalid value: {args.value}")
     
-    from_unit = args.from_unit.lower()
-    to_unit = args.to_unit.lower()
-    
+    # Unit keys are lowercase, so only fold case when the exact spelling misses
+    from_unit = args.from_unit
+    to_unit = args.to_unit
+    ratio = RATIO.get((from_unit, to_unit))
+    if ratio is None:
+        from_unit = from_unit.lower()
+        to_unit = to_unit.lower()
+        ratio = RATIO.get((from_unit, to_unit))
+    
+    if ratio is not None:
+        return {
+            "value": value,
+            "from": from_unit,
+            "to": to_unit,
+            "result": value * ratio
+        }
+    
+    # Miss: temperature, or an invalid pair that needs a specific error
     if from_unit not in UNIT_CONVERSIONS:
         error(f"Unknown unit: {from_unit}", available=list(UNIT_CONVERSIONS.keys()))
     
     if to_unit not in UNIT_CONVERSIONS:
         error(f"Unknown unit: {to_unit}", available=list(UNIT_CONVERSIONS.keys()))
     
-    from_type, from_factor = UNIT_CONVERSIONS[from_unit]
-    to_type, to_factor = UNIT_CONVERSIONS[to_unit]
+    from_type = UNIT_CONVERSIONS[from_unit][0]
+    to_type = UNIT_CONVERSIONS[to_unit][0]
     
     if from_type != to_type:
         error(f"Cannot convert between {from_type} and {to_type}")
     
-    # Special handling for temperature
-    if from_type == "temperature":
-        try:
-            result = convert_temperature(value, from_unit, to_unit)
-        except ValueError as e:
-            error(str(e))
-    else:
-        # Standard conversion: value -> base unit -> target unit
-        base_value = value * from_factor
-        result = base_value / to_factor
+    # Only temperature pairs are left once RATIO has missed
+    try:
+        result = convert_temperature(value, from_unit, to_unit)
+    except ValueError as e:
+        error(str(e))
     
-    output({
+    return {
         "value": value,
         "from": from_unit,
         "to": to_unit,
         "result": result
-    })
+    }
 
 
 # ============================================
 # Main CLI
 # ============================================
 
-def main():
-    parser = argparse.ArgumentParser(
+class _RunParser(argparse.ArgumentParser):
+    """
+    Parser for run(): argument errors come back as CalcError results.
+    
+    run() executes inside a host process (the agent server), so it must
+    never print usage text or raise SystemExit the way argparse does.
+    Subparsers inherit this class.
+    """
+    
+    def error(self, message: str) -> NoReturn:
+        raise CalcError(f"{self.prog}: error: {message}", usage=self.format_usage().strip())
+    
+    def print_help(self, file=None) -> NoReturn:
+        # -h/--help: return the help text instead of printing it
+        raise CalcError("Help requested", usage=self.format_help().strip())
+    
+    def exit(self, status: int = 0, message: Optional[str] = None) -> NoReturn:
+        raise CalcError((message or f"{self.prog}: exited with status {status}").strip())
+
+
+@functools.lru_cache(maxsize=None)
+def build_parser(parser_class: type = argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """Build the CLI parser (cached; parsers are reusable across calls)."""
+    parser = parser_class(
+        prog="calc.py",
         description="Calculator skill - perform various mathematical operations"
     )
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
@@ -404,21 +602,54 @@ def main():
     convert_parser.add_argument("from_unit", help="Source unit")
     convert_parser.add_argument("to_unit", help="Target unit")
     
+    return parser
+
+
+COMMANDS = {
+    "calc": calc_command,
+    "percent": percent_command,
+    "expr": expr_command,
+    "array": array_command,
+    "convert": convert_command,
+}
+
+
+def dispatch(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the parsed subcommand and return its output dict."""
+    try:
+        return COMMANDS[args.command](args)
+    except CalcError as e:
+        return e.data
+
+
+def run(argv: List[str]) -> Dict[str, Any]:
+    """
+    Run a subcommand and return its output dict.
+    
+    Errors, including invalid arguments and a missing subcommand, are
+    returned as a dict with an "error" key; run() never prints or exits.
+    """
+    parser = build_parser(_RunParser)
+    try:
+        args = parser.parse_args(argv)
+    except CalcError as e:
+        return e.data
+    
+    if args.command not in COMMANDS:
+        return {"error": "No subcommand given", "usage": parser.format_help().strip()}
+    
+    return dispatch(args)
+
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
     
-    if args.command == "calc":
-        calc_command(args)
-    elif args.command == "percent":
-        percent_command(args)
-    elif args.command == "expr":
-        expr_command(args)
-    elif args.command == "array":
-        array_command(args)
-    elif args.command == "convert":
-        convert_command(args)
-    else:
+    if args.command not in COMMANDS:
         parser.print_help()
         sys.exit(1)
+    
+    output(dispatch(args))
 
 
 if __name__ == "__main__":
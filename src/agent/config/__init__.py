@@ -1,3 +1,3 @@
-from .settings import settings, Settings
+from .settings import settings, settings_snapshot, Settings
 
-__all__ = ["settings", "Settings"]
+__all__ = ["settings", "settings_snapshot", "Settings"]
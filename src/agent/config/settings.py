@@ -1,10 +1,23 @@
 from pydantic_settings import BaseSettings
-from pydantic import Field
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional, List
 from pathlib import Path
+import dataclasses
+import functools
+import json
 import yaml
 import os
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 
 class ServerConfig(BaseSettings):
     host: str = "0.0.0.0"
@@ -41,6 +54,7 @@ class AgentConfig(BaseSettings):
     max_iterations: int = 15
     max_tool_retries: int = 3
     tool_timeout: float = 30.0
+    text_delta_window: float = 0.02
     circuit_breaker: CircuitBreakerConfig = CircuitBreakerConfig()
 
 
@@ -57,6 +71,19 @@ class ToolsConfig(BaseSettings):
     external_path: Optional[str] = None
 
 
+@functools.lru_cache(maxsize=8)
+def _load_config_file(path: str, mtime: float) -> dict:
+    """
+    Parse a YAML or JSON config file.
+    Cached by (path, mtime) so reloading an unchanged file is free;
+    callers must not mutate the returned dict.
+    """
+    if path.endswith(".json"):
+        return json_loads(Path(path).read_bytes()) or {}
+    with open(path) as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+
 class Settings(BaseSettings):
     server: ServerConfig = ServerConfig()
     llm: LLMConfig = LLMConfig()
@@ -66,11 +93,13 @@ class Settings(BaseSettings):
     
     @classmethod
     def from_yaml(cls, path: str = "config/config.yaml") -> "Settings":
-        """Load settings from YAML file, with environment variable overrides."""
+        """
+        Load settings from a YAML (or .json) file, with environment
+        variable overrides.
+        """
         config_data = {}
         if Path(path).exists():
-            with open(path) as f:
-                config_data = yaml.safe_load(f) or {}
+            config_data = _load_config_file(path, os.path.getmtime(path))
         
         # Handle nested config properly
         instance = cls()
@@ -89,7 +118,7 @@ class Settings(BaseSettings):
         instance.llm.openai_api_key = os.getenv("OPENAI_API_KEY")
         
         if "agent" in config_data:
-            agent_data = config_data["agent"]
+            agent_data = config_data["agent"].copy()
             if "circuit_breaker" in agent_data:
                 agent_data["circuit_breaker"] = CircuitBreakerConfig(**agent_data["circuit_breaker"])
             instance.agent = AgentConfig(**agent_data)
@@ -102,11 +131,109 @@ class Settings(BaseSettings):
         
         return instance
     
+    def snapshot(self) -> "SettingsSnapshot":
+        """
+        Read-only copy of the validated settings as frozen, slotted
+        dataclasses, for code that only reads configuration.
+        """
+        return _snapshot(self)
+    
     model_config = {
         "env_file": ".env",
         "env_nested_delimiter": "__"
     }
 
 
+# Snapshot dataclasses: one per settings model, with the same fields.
+# tests/test_config.py checks they stay in sync.
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ServerSnapshot:
+    host: str
+    port: int
+    heartbeat_interval: int
+    connection_timeout: int
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class LLMCacheSnapshot:
+    enabled: bool
+    cache_system_prompt: bool
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class LLMSnapshot:
+    provider: str
+    model: str
+    max_tokens: int
+    temperature: float
+    cache: LLMCacheSnapshot
+    anthropic_api_key: Optional[str]
+    openai_api_key: Optional[str]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CircuitBreakerSnapshot:
+    failure_threshold: int
+    recovery_timeout: int
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class AgentSnapshot:
+    max_iterations: int
+    max_tool_retries: int
+    tool_timeout: float
+    text_delta_window: float
+    circuit_breaker: CircuitBreakerSnapshot
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SkillsSnapshot:
+    base_path: str
+    auto_discover: bool
+    allowed_commands: List[str]
+    command_timeout: int
+    sandbox: bool
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ToolsSnapshot:
+    builtin_enabled: bool
+    external_path: Optional[str]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SettingsSnapshot:
+    server: ServerSnapshot
+    llm: LLMSnapshot
+    agent: AgentSnapshot
+    skills: SkillsSnapshot
+    tools: ToolsSnapshot
+
+
+SNAPSHOT_CLASSES: Dict[type, type] = {
+    ServerConfig: ServerSnapshot,
+    LLMCacheConfig: LLMCacheSnapshot,
+    LLMConfig: LLMSnapshot,
+    CircuitBreakerConfig: CircuitBreakerSnapshot,
+    AgentConfig: AgentSnapshot,
+    SkillsConfig: SkillsSnapshot,
+    ToolsConfig: ToolsSnapshot,
+    Settings: SettingsSnapshot,
+}
+
+
+def _snapshot(model: BaseModel) -> Any:
+    """Recursively copy a settings model into its snapshot dataclass."""
+    values = {}
+    for name in type(model).model_fields:
+        value = getattr(model, name)
+        values[name] = _snapshot(value) if isinstance(value, BaseModel) else value
+    return SNAPSHOT_CLASSES[type(model)](**values)
+
+
 # Global settings instance
 settings = Settings.from_yaml()
+
+# Frozen view of `settings` for read-only callers
+settings_snapshot: SettingsSnapshot = settings.snapshot()
@@ -2,24 +2,121 @@
 Main ReAct (Reasoning + Acting) agent implementation.
 """
 
-from typing import AsyncIterator, List, Optional, Dict, Any
+from typing import AsyncIterator, Final, List, Optional, Dict, Any
 from dataclasses import dataclass, field
 from ..llm.base import BaseLLM, LLMMessage, LLMResponse, StreamChunk, ToolCall, StopReason
 from ..tools.registry import ToolRegistry
 from ..tools.executor import ToolExecutor, ToolResult
 from ..skills.index import SkillIndex
 from .memory import ConversationMemory
+import asyncio
 import logging
 import time
 
 logger = logging.getLogger(__name__)
 
+# AgentEvent types; the server forwards them as ServerMessage.type
+EVENT_PROCESSING_START: Final = "processing_start"
+EVENT_ITERATION_START: Final = "iteration_start"
+EVENT_TEXT_DELTA: Final = "text_delta"
+EVENT_TOOL_START: Final = "tool_start"
+EVENT_TOOL_CALL_COMPLETE: Final = "tool_call_complete"
+EVENT_ERROR: Final = "error"
+EVENT_COMPLETE: Final = "complete"
+EVENT_EXECUTING_TOOLS: Final = "executing_tools"
+EVENT_TOOL_RESULT: Final = "tool_result"
+EVENT_MAX_ITERATIONS: Final = "max_iterations"
+
+
+async def coalesce_text_deltas(
+    chunks: AsyncIterator[StreamChunk],
+    window: float
+) -> AsyncIterator[StreamChunk]:
+    """
+    Merge text_delta chunks that arrive within `window` seconds of the
+    first one in a run. Any other chunk flushes pending text before it is
+    passed through, so ordering is preserved. If `chunks` raises, pending
+    text is yielded before the exception propagates.
+    
+    While text is pending, the next chunk is awaited as a task so the wait
+    can time out without cancelling it. At most one __anext__ call is in
+    flight at a time, as async generators require; on exit it is cancelled
+    and awaited.
+    """
+    if window <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+    
+    loop = asyncio.get_running_loop()
+    it = chunks.__aiter__()
+    pending: List[str] = []
+    deadline = 0.0
+    next_chunk: Optional[asyncio.Future] = None
+    
+    try:
+        while True:
+            if pending:
+                # Wait for the next chunk only until the window closes;
+                # the same task is awaited again after flushing.
+                if next_chunk is None:
+                    next_chunk = asyncio.ensure_future(it.__anext__())
+                timeout = max(deadline - loop.time(), 0)
+                done, _ = await asyncio.wait({next_chunk}, timeout=timeout)
+                if not done:
+                    yield StreamChunk(type="text_delta", content="".join(pending))
+                    pending.clear()
+                    continue
+            
+            try:
+                if next_chunk is not None:
+                    chunk = await next_chunk
+                else:
+                    chunk = await it.__anext__()
+            except StopAsyncIteration:
+                break
+            except Exception:
+                # Don't lose text that arrived before the stream failed
+                if pending:
+                    text = "".join(pending)
+                    pending.clear()
+                    yield StreamChunk(type="text_delta", content=text)
+                raise
+            finally:
+                next_chunk = None
+            
+            if chunk.type == "text_delta":
+                if not pending:
+                    deadline = loop.time() + window
+                pending.append(chunk.content)
+                continue
+            
+            if pending:
+                yield StreamChunk(type="text_delta", content="".join(pending))
+                pending.clear()
+            yield chunk
+        
+        if pending:
+            yield StreamChunk(type="text_delta", content="".join(pending))
+    finally:
+        if next_chunk is not None:
+            next_chunk.cancel()
+            await asyncio.wait({next_chunk})
+            if not next_chunk.cancelled():
+                next_chunk.exception()  # mark retrieved; the chunk is dropped
+
 
 @dataclass
 class AgentEvent:
-    """Event emitted during agent processing."""
+    """
+    Event emitted during agent processing.
+    
+    Text (streamed deltas, the final answer) goes in `content`, apart from
+    `data`, so both map onto the ServerMessage fields without copying.
+    """
     type: str
     data: Dict[str, Any] = field(default_factory=dict)
+    content: Optional[str] = None
 
 
 @dataclass
@@ -48,7 +145,8 @@ class ReactAgent:
         tool_registry: ToolRegistry,
         skill_index: SkillIndex,
         system_prompt: str,
-        max_iterations: int = 15
+        max_iterations: int = 15,
+        text_delta_window: float = 0.02
     ):
         self.llm = llm
         self.tool_registry = tool_registry
@@ -56,10 +154,20 @@ class ReactAgent:
         self.executor = ToolExecutor(tool_registry)
         self.system_prompt = system_prompt
         self.max_iterations = max_iterations
+        self.text_delta_window = text_delta_window
         self.memory = ConversationMemory()
+        self._prompt_cache_key: Optional[tuple] = None
+        self._cached_system_prompt = ""
     
     def _build_system_prompt(self) -> str:
-        """Build complete system prompt with skill information."""
+        """
+        Build complete system prompt with skill information.
+        Cached until the skill index or base prompt changes.
+        """
+        cache_key = (self.skill_index.version, self.system_prompt)
+        if cache_key == self._prompt_cache_key:
+            return self._cached_system_prompt
+        
         skill_info = ""
         skills = self.skill_index.list_skills()
         
@@ -79,7 +187,9 @@ The following skills are available. Use `read_skill` to get documentation before
 **Important**: Always call `read_skill("skill_name")` to read the SKILL.md documentation BEFORE attempting to use any skill. The documentation contains the exact command formats and examples you need.
 """
         
-        return self.system_prompt + skill_info
+        self._cached_system_prompt = self.system_prompt + skill_info
+        self._prompt_cache_key = cache_key
+        return self._cached_system_prompt
     
     async def process(self, user_message: str) -> AgentResponse:
         """
@@ -96,13 +206,13 @@ The following skills are available. Use `read_skill` to get documentation before
         system_prompt = self._build_system_prompt()
         tool_schemas = self.tool_registry.list_schemas()
         
-        for iteration in range(self.max_iterations):
-            iterations = iteration + 1
+        while iterations < self.max_iterations:
+            iterations += 1
             logger.debug(f"ReAct iteration {iterations}")
             
             try:
                 response = await self.llm.complete(
-                    messages=self.memory.get_messages(),
+                    messages=self.memory.view_messages(),
                     tools=tool_schemas,
                     system_prompt=system_prompt
                 )
@@ -124,12 +234,7 @@ The following skills are available. Use `read_skill` to get documentation before
             )
             
             # Execute all tool calls in parallel
-            tool_call_dicts = [
-                {"id": tc.id, "name": tc.name, "input": tc.input}
-                for tc in response.tool_calls
-            ]
-            
-            results = await self.executor.execute_parallel(tool_call_dicts)
+            results = await self.executor.execute_parallel(response.tool_calls)
             
             # Process results
             for result in results:
@@ -171,32 +276,33 @@ The following skills are available. Use `read_skill` to get documentation before
         system_prompt = self._build_system_prompt()
         tool_schemas = self.tool_registry.list_schemas()
         
-        yield AgentEvent(type="processing_start", data={"message": user_message})
+        yield AgentEvent(type=EVENT_PROCESSING_START, data={"message": user_message})
         
-        for iteration in range(self.max_iterations):
-            yield AgentEvent(type="iteration_start", data={"iteration": iteration + 1})
+        iterations = 0
+        while iterations < self.max_iterations:
+            iterations += 1
+            yield AgentEvent(type=EVENT_ITERATION_START, data={"iteration": iterations})
             
-            # Collect response through streaming
-            full_content = ""
+            # Collect response through streaming; token deltas are merged
+            # over a short window to cut per-token events and WS frames
+            content_parts: List[str] = []
             tool_calls: List[ToolCall] = []
             
             try:
-                async for chunk in self.llm.stream(
-                    messages=self.memory.get_messages(),
+                stream = self.llm.stream(
+                    messages=self.memory.view_messages(),
                     tools=tool_schemas,
                     system_prompt=system_prompt
-                ):
+                )
+                async for chunk in coalesce_text_deltas(stream, self.text_delta_window):
                     if chunk.type == "text_delta":
-                        full_content += chunk.content
-                        yield AgentEvent(
-                            type="text_delta",
-                            data={"content": chunk.content}
-                        )
+                        content_parts.append(chunk.content)
+                        yield AgentEvent(type=EVENT_TEXT_DELTA, content=chunk.content)
                     
                     elif chunk.type == "tool_use_start":
                         logger.info(f"Tool starting: {chunk.tool_call.name} (id: {chunk.tool_call.id})")
                         yield AgentEvent(
-                            type="tool_start",
+                            type=EVENT_TOOL_START,
                             data={
                                 "tool_name": chunk.tool_call.name,
                                 "tool_id": chunk.tool_call.id
@@ -207,7 +313,7 @@ The following skills are available. Use `read_skill` to get documentation before
                         tool_calls.append(chunk.tool_call)
                         logger.info(f"Tool call parsed: {chunk.tool_call.name} (id: {chunk.tool_call.id})")
                         yield AgentEvent(
-                            type="tool_call_complete",
+                            type=EVENT_TOOL_CALL_COMPLETE,
                             data={
                                 "tool_name": chunk.tool_call.name,
                                 "tool_id": chunk.tool_call.id
@@ -216,7 +322,7 @@ The following skills are available. Use `read_skill` to get documentation before
                     
                     elif chunk.type == "error":
                         yield AgentEvent(
-                            type="error",
+                            type=EVENT_ERROR,
                             data={"error": chunk.error}
                         )
                         return
@@ -226,20 +332,22 @@ The following skills are available. Use `read_skill` to get documentation before
             
             except Exception as e:
                 logger.exception(f"Streaming error: {e}")
-                yield AgentEvent(type="error", data={"error": str(e)})
+                yield AgentEvent(type=EVENT_ERROR, data={"error": str(e)})
                 return
             
+            full_content = "".join(content_parts)
+            
             # No tool calls = final response
             if not tool_calls:
                 self.memory.add_assistant_message(full_content)
                 total_time = (time.time() - start_time) * 1000
                 yield AgentEvent(
-                    type="complete",
+                    type=EVENT_COMPLETE,
                     data={
-                        "content": full_content,
-                        "iterations": iteration + 1,
+                        "iterations": iterations,
                         "total_time_ms": total_time
-                    }
+                    },
+                    content=full_content
                 )
                 return
             
@@ -247,18 +355,13 @@ The following skills are available. Use `read_skill` to get documentation before
             self.memory.add_assistant_message(full_content, tool_calls=tool_calls)
             
             yield AgentEvent(
-                type="executing_tools",
+                type=EVENT_EXECUTING_TOOLS,
                 data={"count": len(tool_calls)}
             )
             
             # Execute tools in parallel
-            tool_call_dicts = [
-                {"id": tc.id, "name": tc.name, "input": tc.input}
-                for tc in tool_calls
-            ]
-            
-            logger.info(f"Executing {len(tool_call_dicts)} tools in parallel")
-            results = await self.executor.execute_parallel(tool_call_dicts)
+            logger.info(f"Executing {len(tool_calls)} tools in parallel")
+            results = await self.executor.execute_parallel(tool_calls)
             
             for result in results:
                 logger.info(f"Tool result: {result.tool_name} - {'success' if result.success else 'failed'} ({result.execution_time_ms:.0f}ms)")
@@ -269,7 +372,7 @@ The following skills are available. Use `read_skill` to get documentation before
                 )
                 
                 yield AgentEvent(
-                    type="tool_result",
+                    type=EVENT_TOOL_RESULT,
                     data={
                         "tool_id": result.tool_call_id,
                         "tool_name": result.tool_name,
@@ -281,7 +384,7 @@ The following skills are available. Use `read_skill` to get documentation before
         # Max iterations reached
         total_time = (time.time() - start_time) * 1000
         yield AgentEvent(
-            type="max_iterations",
+            type=EVENT_MAX_ITERATIONS,
             data={
                 "iterations": self.max_iterations,
                 "total_time_ms": total_time
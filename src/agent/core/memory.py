@@ -2,8 +2,9 @@
 Conversation memory management.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Deque, List, Optional, Sequence
 from ..llm.base import LLMMessage, ToolCall
 import json
 
@@ -12,15 +13,18 @@ import json
 class ConversationMemory:
     """
     Manages conversation history with context window awareness.
+    History is a bounded deque, so the oldest message drops off in O(1).
     """
     
     max_messages: int = 100  # Maximum messages to retain
-    messages: List[LLMMessage] = field(default_factory=list)
+    messages: Deque[LLMMessage] = field(default_factory=deque)
+    
+    def __post_init__(self):
+        self.messages = deque(self.messages, maxlen=self.max_messages)
     
     def add_user_message(self, content: str):
         """Add a user message to history."""
         self.messages.append(LLMMessage(role="user", content=content))
-        self._trim_if_needed()
     
     def add_assistant_message(
         self,
@@ -40,7 +44,6 @@ class ConversationMemory:
             content=content,
             tool_calls=tc_dicts
         ))
-        self._trim_if_needed()
     
     def add_tool_result(self, tool_call_id: str, result: str):
         """Add a tool result to history."""
@@ -49,22 +52,21 @@ class ConversationMemory:
             content=result,
             tool_call_id=tool_call_id
         ))
-        self._trim_if_needed()
     
     def get_messages(self) -> List[LLMMessage]:
-        """Get all messages for LLM context."""
-        return self.messages.copy()
+        """Get a copy of all messages, safe to modify."""
+        return list(self.messages)
     
-    def _trim_if_needed(self):
-        """Trim old messages if exceeding limit."""
-        if len(self.messages) > self.max_messages:
-            # Keep the most recent messages
-            excess = len(self.messages) - self.max_messages
-            self.messages = self.messages[excess:]
+    def view_messages(self) -> Sequence[LLMMessage]:
+        """
+        Get all messages without copying, for LLM context.
+        The view is live and read-only: callers must not mutate it.
+        """
+        return self.messages
     
     def clear(self):
         """Clear all history."""
-        self.messages = []
+        self.messages.clear()
     
     def get_last_user_message(self) -> Optional[str]:
         """Get the most recent user message."""
@@ -81,6 +83,5 @@ class ConversationMemory:
     def from_dict(cls, data: List[dict]) -> "ConversationMemory":
         """Deserialize from persistence."""
         memory = cls()
-        for item in data:
-            memory.messages.append(LLMMessage(**item))
+        memory.messages.extend(LLMMessage(**item) for item in data)
         return memory
@@ -1,17 +1,44 @@
 from anthropic import AsyncAnthropic
 from .base import BaseLLM, LLMMessage, LLMResponse, StreamChunk, ToolCall, StopReason
 from .tracer import tracer
-from typing import List, Optional, AsyncIterator, Dict, Any
+from typing import List, Optional, AsyncIterator, Dict, Any, Sequence
+import functools
 import json
 import logging
 import time
 
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=32)
+def _cached_system_block(system_prompt: str) -> List[Dict]:
+    """
+    System prompt wrapped as a cache_control text block. Shared across
+    adapter instances, so every connection sends the identical object for
+    the same prompt. Treat the result as read-only.
+    """
+    return [{
+        "type": "text",
+        "text": system_prompt,
+        "cache_control": {"type": "ephemeral"}
+    }]
+
+
 class AnthropicLLM(BaseLLM):
     """Claude adapter with streaming and prompt caching support."""
     
+    _STOP_REASON_MAP = {
+        "end_turn": StopReason.END_TURN,
+        "tool_use": StopReason.TOOL_USE,
+        "max_tokens": StopReason.MAX_TOKENS,
+    }
+    
     def __init__(
         self,
         model: str = "claude-sonnet-4-5-20250929",
@@ -25,6 +52,10 @@ class AnthropicLLM(BaseLLM):
         self._enable_cache = enable_cache
         self._max_tokens = max_tokens
         self._temperature = temperature
+        
+        # Last (input, converted) tools pair; tools are stable across the
+        # iterations of a request and usually across requests
+        self._tools_cache: Optional[tuple] = None
     
     @property
     def provider_name(self) -> str:
@@ -34,17 +65,15 @@ class AnthropicLLM(BaseLLM):
     def model_name(self) -> str:
         return self._model
     
-    def _convert_messages(self, messages: List[LLMMessage]) -> List[Dict]:
+    def _convert_messages(self, messages: Sequence[LLMMessage]) -> List[Dict]:
         """Convert unified messages to Anthropic format."""
         converted = []
+        append = converted.append
         
         for msg in messages:
-            if msg.role == "system":
-                # System messages handled separately in Anthropic
-                continue
-            
-            if msg.role == "tool_result":
-                converted.append({
+            role = msg.role
+            if role == "tool_result":
+                append({
                     "role": "user",
                     "content": [{
                         "type": "tool_result",
@@ -52,11 +81,12 @@ class AnthropicLLM(BaseLLM):
                         "content": msg.content
                     }]
                 })
+            elif role == "system":
+                # System messages handled separately in Anthropic
+                continue
             elif msg.tool_calls:
                 # Assistant message with tool calls
-                content = []
-                if msg.content:
-                    content.append({"type": "text", "text": msg.content})
+                content = [{"type": "text", "text": msg.content}] if msg.content else []
                 for tc in msg.tool_calls:
                     content.append({
                         "type": "tool_use",
@@ -64,18 +94,19 @@ class AnthropicLLM(BaseLLM):
                         "name": tc["name"],
                         "input": tc["input"]
                     })
-                converted.append({"role": "assistant", "content": content})
+                append({"role": "assistant", "content": content})
             else:
-                converted.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
+                append({"role": role, "content": msg.content})
         
         return converted
     
     def _convert_tools(self, tools: List[Dict]) -> List[Dict]:
         """Convert generic tool schemas to Anthropic format."""
-        return [
+        cached = self._tools_cache
+        if cached is not None and cached[0] == tools:
+            return cached[1]
+        
+        converted = [
             {
                 "name": t["name"],
                 "description": t["description"],
@@ -83,29 +114,22 @@ class AnthropicLLM(BaseLLM):
             }
             for t in tools
         ]
+        self._tools_cache = (list(tools), converted)
+        return converted
     
     def _build_system_prompt(self, system_prompt: str) -> Any:
         """Build system prompt with optional caching."""
         if self._enable_cache:
-            return [{
-                "type": "text",
-                "text": system_prompt,
-                "cache_control": {"type": "ephemeral"}
-            }]
+            return _cached_system_block(system_prompt)
         return system_prompt
     
     def _parse_stop_reason(self, reason: str) -> StopReason:
         """Convert Anthropic stop reason to unified format."""
-        mapping = {
-            "end_turn": StopReason.END_TURN,
-            "tool_use": StopReason.TOOL_USE,
-            "max_tokens": StopReason.MAX_TOKENS,
-        }
-        return mapping.get(reason, StopReason.END_TURN)
+        return self._STOP_REASON_MAP.get(reason, StopReason.END_TURN)
     
     async def complete(
         self,
-        messages: List[LLMMessage],
+        messages: Sequence[LLMMessage],
         tools: Optional[List[Dict]] = None,
         system_prompt: Optional[str] = None,
         **kwargs
@@ -158,7 +182,7 @@ class AnthropicLLM(BaseLLM):
     
     async def stream(
         self,
-        messages: List[LLMMessage],
+        messages: Sequence[LLMMessage],
         tools: Optional[List[Dict]] = None,
         system_prompt: Optional[str] = None,
         **kwargs
@@ -181,7 +205,7 @@ class AnthropicLLM(BaseLLM):
         
         # Trace the request
         trace_id = tracer.trace_request(
-            messages=[m.to_dict() for m in messages],
+            messages=messages,
             system_prompt=system_prompt,
             tools=tools,
             model=self._model,
@@ -196,7 +220,7 @@ class AnthropicLLM(BaseLLM):
         try:
             async with self._client.messages.stream(**request) as stream:
                 current_tool: Optional[Dict] = None
-                tool_input_json = ""
+                tool_input_buf = bytearray()
                 
                 async for event in stream:
                     if event.type == "content_block_start":
@@ -207,7 +231,7 @@ class AnthropicLLM(BaseLLM):
                                     "id": block.id,
                                     "name": block.name,
                                 }
-                                tool_input_json = ""
+                                tool_input_buf.clear()
                                 logger.info(f"[{trace_id}] Tool call started: {block.name}")
                                 yield StreamChunk(
                                     type="tool_use_start",
@@ -224,15 +248,15 @@ class AnthropicLLM(BaseLLM):
                             collected_content += delta.text
                             yield StreamChunk(type="text_delta", content=delta.text)
                         elif hasattr(delta, 'partial_json'):
-                            tool_input_json += delta.partial_json
+                            tool_input_buf += delta.partial_json.encode()
                     
                     elif event.type == "content_block_stop":
                         if current_tool:
                             # Parse complete tool input
                             try:
-                                parsed_input = json.loads(tool_input_json) if tool_input_json else {}
+                                parsed_input = json_loads(tool_input_buf) if tool_input_buf else {}
                             except json.JSONDecodeError:
-                                parsed_input = {"raw": tool_input_json}
+                                parsed_input = {"raw": tool_input_buf.decode()}
                             
                             tool_call = ToolCall(
                                 id=current_tool["id"],
@@ -247,7 +271,7 @@ class AnthropicLLM(BaseLLM):
                                 tool_call=tool_call
                             )
                             current_tool = None
-                            tool_input_json = ""
+                            tool_input_buf.clear()
                     
                     elif event.type == "message_stop":
                         duration_ms = (time.time() - start_time) * 1000
@@ -258,7 +282,7 @@ class AnthropicLLM(BaseLLM):
                             trace_id=trace_id,
                             response={
                                 "content": collected_content,
-                                "tool_calls": [{"id": tc.id, "name": tc.name, "input": tc.input} for tc in collected_tool_calls]
+                                "tool_calls": collected_tool_calls
                             },
                             duration_ms=duration_ms
                         )
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional, AsyncIterator, Any, Dict
+from typing import List, Optional, AsyncIterator, Any, Dict, Sequence
 from enum import Enum
 
 
@@ -11,7 +11,7 @@ class StopReason(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMMessage:
     """Unified message format across providers."""
     role: str  # "system" | "user" | "assistant" | "tool_result"
@@ -28,7 +28,7 @@ class LLMMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     """Represents a tool call from the LLM."""
     id: str
@@ -36,7 +36,7 @@ class ToolCall:
     input: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     """Complete response from LLM."""
     content: str
@@ -49,7 +49,7 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamChunk:
     """Streaming chunk from LLM."""
     type: str  # "text_delta" | "tool_use_start" | "tool_use_delta" | "tool_use_complete" | "done" | "error"
@@ -76,7 +76,7 @@ class BaseLLM(ABC):
     @abstractmethod
     async def complete(
         self,
-        messages: List[LLMMessage],
+        messages: Sequence[LLMMessage],
         tools: Optional[List[Dict]] = None,
         system_prompt: Optional[str] = None,
         **kwargs
@@ -87,7 +87,7 @@ class BaseLLM(ABC):
     @abstractmethod
     async def stream(
         self,
-        messages: List[LLMMessage],
+        messages: Sequence[LLMMessage],
         tools: Optional[List[Dict]] = None,
         system_prompt: Optional[str] = None,
         **kwargs
@@ -2,9 +2,16 @@
 LLM Tracing - saves all LLM inputs and outputs for debugging.
 """
 
+import atexit
+import collections
+import dataclasses
 import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import logging
@@ -12,41 +19,122 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _default(obj: Any) -> Any:
+    """Fallback encoder for values JSON has no native form for."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, collections.deque):
+        return list(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__dict__'):
+        return {k: v for k, v in obj.__dict__.items() if not k.startswith('_')}
+    return str(obj)
+
+
+try:
+    import orjson
+    
+    # orjson encodes dataclasses, enums and datetimes natively, so traced
+    # objects are passed through as-is and _default only sees the rest.
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+except ImportError:
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None, default=_default).encode()
+
+
 class LLMTracer:
-    """Traces LLM calls to files for debugging and analysis."""
+    """
+    Traces LLM calls to files for debugging and analysis.
+    
+    Payloads are serialized on the caller's thread and handed to a daemon
+    writer thread, so tracing never does file I/O on the event loop.
+    """
+    
+    # Most queued writes the writer thread handles per batch
+    WRITE_BATCH = 256
     
     def __init__(self, trace_dir: str = "llm_traces"):
         self.trace_dir = Path(trace_dir)
         self.trace_dir.mkdir(parents=True, exist_ok=True)
-        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        started_at = datetime.now()
+        self._start_ns = time.monotonic_ns()
+        self.session_id = started_at.strftime("%Y%m%d_%H%M%S")
         self.call_count = 0
         
         # Create session directory
         self.session_dir = self.trace_dir / self.session_id
         self.session_dir.mkdir(parents=True, exist_ok=True)
         
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer_thread = threading.Thread(
+            target=self._writer, name="llm-tracer", daemon=True
+        )
+        self._writer_thread.start()
+        atexit.register(self.flush)
+        
+        # JSONL records carry a monotonic "ts_ns" instead of an ISO string;
+        # wall-clock time is started_at + (ts_ns - monotonic_ns)
+        self._write(self.session_dir / "session.json", _dumps({
+            "session_id": self.session_id,
+            "started_at": started_at.isoformat(),
+            "monotonic_ns": self._start_ns
+        }, indent=True))
+        
         logger.info(f"LLM Tracer initialized. Traces will be saved to: {self.session_dir}")
     
-    def _serialize(self, obj: Any) -> Any:
-        """Serialize objects for JSON."""
-        if hasattr(obj, '__dict__'):
-            return {k: self._serialize(v) for k, v in obj.__dict__.items() if not k.startswith('_')}
-        elif isinstance(obj, (list, tuple)):
-            return [self._serialize(item) for item in obj]
-        elif isinstance(obj, dict):
-            return {k: self._serialize(v) for k, v in obj.items()}
-        elif hasattr(obj, 'value'):  # Enum
-            return obj.value
-        else:
-            try:
-                json.dumps(obj)
-                return obj
-            except (TypeError, ValueError):
-                return str(obj)
+    def _write(self, path: Path, data: bytes, append: bool = False):
+        """Queue bytes to be written (or appended) to a trace file."""
+        self._queue.put((path, data, append))
+    
+    def _writer(self):
+        """Drain the queue in batches, one write per file per batch."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # path -> (truncate first?, chunks), in first-seen order
+            files: Dict[Path, tuple] = {}
+            done: List[threading.Event] = []
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    done.append(item)
+                    continue
+                path, data, append = item
+                if not append or path not in files:
+                    files[path] = (not append, [data])
+                else:
+                    files[path][1].append(data)
+            
+            for path, (truncate, chunks) in files.items():
+                try:
+                    with open(path, 'wb' if truncate else 'ab') as f:
+                        f.write(b"".join(chunks))
+                except OSError as e:
+                    logger.warning(f"Failed to write trace file {path}: {e}")
+            
+            for event in done:
+                event.set()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far has been written."""
+        if not self._writer_thread.is_alive():
+            return False
+        event = threading.Event()
+        self._queue.put(event)
+        return event.wait(timeout)
     
     def trace_request(
         self,
-        messages: List[Dict],
+        messages: List[Any],
         system_prompt: Optional[str],
         tools: Optional[List[Dict]],
         model: str,
@@ -66,9 +154,9 @@ class LLMTracer:
             "timestamp": datetime.now().isoformat(),
             "model": model,
             "system_prompt": system_prompt,
-            "messages": self._serialize(messages),
+            "messages": messages,
             "tools": tools,
-            "kwargs": self._serialize(kwargs),
+            "kwargs": kwargs,
             "response": None,
             "error": None,
             "duration_ms": None
@@ -76,8 +164,7 @@ class LLMTracer:
         
         # Save request immediately
         trace_file = self.session_dir / f"{trace_id}_request.json"
-        with open(trace_file, 'w') as f:
-            json.dump(trace_data, f, indent=2, default=str)
+        self._write(trace_file, _dumps(trace_data, indent=True))
         
         logger.debug(f"Traced LLM request: {trace_id}")
         return trace_id
@@ -93,27 +180,25 @@ class LLMTracer:
         trace_data = {
             "trace_id": trace_id,
             "timestamp": datetime.now().isoformat(),
-            "response": self._serialize(response) if response else None,
+            "response": response if response else None,
             "error": error,
             "duration_ms": duration_ms
         }
         
         # Save response
         trace_file = self.session_dir / f"{trace_id}_response.json"
-        with open(trace_file, 'w') as f:
-            json.dump(trace_data, f, indent=2, default=str)
+        self._write(trace_file, _dumps(trace_data, indent=True))
         
         logger.debug(f"Traced LLM response: {trace_id} ({duration_ms:.0f}ms)")
     
     def trace_stream_chunk(self, trace_id: str, chunk: Any):
         """Trace a streaming chunk (appends to file)."""
         chunk_file = self.session_dir / f"{trace_id}_stream.jsonl"
-        with open(chunk_file, 'a') as f:
-            chunk_data = {
-                "timestamp": datetime.now().isoformat(),
-                "chunk": self._serialize(chunk)
-            }
-            f.write(json.dumps(chunk_data, default=str) + "\n")
+        chunk_data = {
+            "ts_ns": time.monotonic_ns(),
+            "chunk": chunk
+        }
+        self._write(chunk_file, _dumps(chunk_data) + b"\n", append=True)
     
     def trace_tool_call(
         self,
@@ -127,7 +212,7 @@ class LLMTracer:
         """Trace a tool call."""
         tool_data = {
             "trace_id": trace_id,
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.monotonic_ns(),
             "tool_name": tool_name,
             "input": tool_input,
             "output": str(tool_output)[:1000],  # Truncate large outputs
@@ -137,11 +222,47 @@ class LLMTracer:
         
         # Append to tools file
         tools_file = self.session_dir / f"{trace_id}_tools.jsonl"
-        with open(tools_file, 'a') as f:
-            f.write(json.dumps(tool_data, default=str) + "\n")
+        self._write(tools_file, _dumps(tool_data) + b"\n", append=True)
         
         logger.debug(f"Traced tool call: {tool_name} ({duration_ms:.0f}ms)")
 
 
+class _NullTracer:
+    """Stand-in used when tracing is disabled; every trace call is a no-op."""
+    
+    def trace_request(self, *args, **kwargs) -> str:
+        return ""
+    
+    def trace_response(self, *args, **kwargs):
+        pass
+    
+    def trace_stream_chunk(self, *args, **kwargs):
+        pass
+    
+    def trace_tool_call(self, *args, **kwargs):
+        pass
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        return True
+
+
+class _LazyTracer:
+    """
+    Defers creating the real tracer (directories, writer thread) until the
+    first trace call. Set AGENT_TRACE=0 to disable tracing entirely.
+    """
+    
+    def __init__(self):
+        self._real = None
+    
+    def __getattr__(self, name: str) -> Any:
+        if self._real is None:
+            if os.environ.get("AGENT_TRACE", "1") == "0":
+                self._real = _NullTracer()
+            else:
+                self._real = LLMTracer()
+        return getattr(self._real, name)
+
+
 # Global tracer instance
-tracer = LLMTracer()
+tracer = _LazyTracer()
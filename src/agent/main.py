@@ -11,7 +11,7 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from agent.transport.server import app
-from agent.config.settings import settings
+from agent.config.settings import settings_snapshot
 
 # Configure logging
 logging.basicConfig(
@@ -24,8 +24,8 @@ def main():
     """Start the agent server."""
     uvicorn.run(
         "agent.transport.server:app",
-        host=settings.server.host,
-        port=settings.server.port,
+        host=settings_snapshot.server.host,
+        port=settings_snapshot.server.port,
         reload=True,
         log_level="info"
     )
@@ -75,6 +75,10 @@ class CircuitBreaker:
         Raises:
             CircuitBreakerOpen: If circuit is open
         """
+        # Fast path: reading the state reference is atomic, and a closed
+        # circuit has no transition to make, so skip the lock
+        if self._state is CircuitState.CLOSED:
+            return
         if self.state == CircuitState.OPEN:
             raise CircuitBreakerOpen(
                 f"Circuit breaker '{self.name}' is open. "
@@ -83,6 +87,10 @@ class CircuitBreaker:
     
     def record_success(self):
         """Record a successful call."""
+        # Fast path: closed with no failures means there is nothing to reset.
+        # A failure racing with this read is ordered after the success.
+        if self._state is CircuitState.CLOSED and self._failure_count == 0:
+            return
         with self._lock:
             if self._state == CircuitState.HALF_OPEN:
                 self._success_count += 1
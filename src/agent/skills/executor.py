@@ -3,16 +3,38 @@ Secure command execution for skills.
 """
 
 import asyncio
+import importlib.util
+import json
+import os
+import re
 import shlex
+import signal
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional, List
+from types import ModuleType
+from typing import Callable, Dict, Optional, List, Tuple
+from .loader import SkillLoader
 import logging
 
 logger = logging.getLogger(__name__)
 
+_POSIX = os.name == "posix"
 
-@dataclass
+
+def _call_run(run: Callable, argv: List[str]) -> Optional[dict]:
+    """
+    Call run(argv) on the worker thread, turning SystemExit into None.
+    
+    SystemExit must not leave the thread: asyncio re-raises it from the
+    task awaiting to_thread, out of the event loop, stopping the server.
+    """
+    try:
+        return run(argv)
+    except SystemExit:
+        return None
+
+
+@dataclass(slots=True)
 class CommandResult:
     """Result of command execution."""
     success: bool
@@ -32,58 +54,193 @@ class SkillCommandExecutor:
         base_path: Path,
         allowed_prefixes: List[str],
         timeout: int = 60,
-        sandbox: bool = False
+        sandbox: bool = False,
+        max_output_bytes: int = 1 << 20
     ):
         self.base_path = base_path
         self.allowed_prefixes = allowed_prefixes
+        self._allowed_prefix_tuple = tuple(p.lower() for p in allowed_prefixes)
         self.timeout = timeout
         self.sandbox = sandbox  # Future: container/sandbox execution
+        self.max_output_bytes = max_output_bytes  # per stream, rest is discarded
+        # Shell chaining (&&, ||, ;, |) and command substitution (`, $());
+        # "||" precedes "|" so the reported operator is the full token
+        self._danger_re = re.compile(r"&&|\|\||;|\||`|\$\(")
+        self._quote_re = re.compile(r"[\"'\\`]")
+        # Skill scripts loaded for in-process dispatch: path -> (mtime_ns, module)
+        self._script_modules: Dict[Path, Tuple[int, Optional[ModuleType]]] = {}
     
-    def _validate_command(self, command: str) -> tuple[bool, str]:
+    def _validate_command(self, command: str) -> Tuple[bool, str, List[str]]:
         """
         Validate command against security rules.
         
         Returns:
-            Tuple of (is_valid, error_message)
+            Tuple of (is_valid, error_message, argv)
         """
         if not command or not command.strip():
-            return False, "Empty command"
+            return False, "Empty command", []
         
-        # Check if command starts with allowed prefix
-        try:
-            parts = shlex.split(command)
-        except ValueError as e:
-            return False, f"Invalid command format: {e}"
+        # Commands without quotes, escapes or backticks split the same way
+        # on whitespace, so shlex is only needed for the rest
+        if self._quote_re.search(command):
+            try:
+                parts = shlex.split(command)
+            except ValueError as e:
+                return False, f"Invalid command format: {e}", []
             
-        if not parts:
-            return False, "Invalid command format"
+            if not parts:
+                return False, "Invalid command format", []
+        else:
+            parts = command.split()
+        
+        # Check if command starts with allowed prefix, allowing full paths to python
+        cmd_prefix = parts[0].rsplit('/', 1)[-1].lower()
+        
+        if not cmd_prefix.startswith(self._allowed_prefix_tuple):
+            return False, f"Command '{parts[0]}' not allowed. Allowed: {', '.join(self.allowed_prefixes)}", []
+        
+        # Commands run without a shell, so these would only reach the program
+        # as literal arguments; rejecting them keeps the error explicit
+        m = self._danger_re.search(command)
+        if m:
+            return False, f"Shell operators not allowed: {m.group(0)}", []
+        
+        return True, "", parts
+    
+    @staticmethod
+    def _kill(process: asyncio.subprocess.Process):
+        """Kill a timed-out command along with everything it spawned."""
+        try:
+            if _POSIX:
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+    
+    @staticmethod
+    async def _read_capped(stream: asyncio.StreamReader, limit: int) -> str:
+        """
+        Read a pipe to EOF, keeping at most `limit` bytes.
+        
+        Output past the limit is drained without being stored, so the child
+        never blocks on a full pipe.
+        """
+        buf = bytearray()
+        truncated = False
+        while chunk := await stream.read(65536):
+            room = limit - len(buf)
+            if len(chunk) > room:
+                buf += chunk[:room]
+                truncated = True
+            else:
+                buf += chunk
+        text = buf.decode('utf-8', errors='replace').strip()
+        if truncated:
+            text += f"\n[output truncated at {limit} bytes]"
+        return text
+    
+    def _load_script(self, script: Path) -> Optional[ModuleType]:
+        """
+        Import a skill script as a module, reloading it when the file changes.
+        
+        Only called for scripts their SKILL.md declares under in_process.
+        """
+        try:
+            mtime_ns = script.stat().st_mtime_ns
+        except OSError:
+            return None
+        
+        cached = self._script_modules.get(script)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
+        module = None
+        try:
+            spec = importlib.util.spec_from_file_location(f"_skill_script_{script.stem}", script)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except (Exception, SystemExit) as e:
+            logger.warning(f"Cannot load {script} for in-process execution: {e!r}")
+            module = None
         
-        cmd_prefix = parts[0].lower()
+        # Scripts that can't run in-process are cached too, as None
+        self._script_modules[script] = (mtime_ns, module)
+        return module
+    
+    def _resolve_in_process(self, parts: List[str], cwd: Path) -> Optional[Tuple[Callable, List[str]]]:
+        """
+        Resolve `python <script>.py <subcommand> args...` to the script's run(argv).
         
-        # Allow full paths to python
-        if '/' in cmd_prefix:
-            cmd_prefix = cmd_prefix.split('/')[-1]
+        In-process dispatch is opt-in: the skill's SKILL.md must list the
+        script and subcommand under `in_process`. A worker thread can't be
+        killed on timeout and CPU-bound Python holds the GIL, so only
+        subcommands with bounded run time should be listed. Anything else
+        returns None and goes through a subprocess.
+        """
+        if len(parts) < 3 or not parts[0].split('/')[-1].lower().startswith("python"):
+            return None
+        if not parts[1].endswith(".py"):
+            return None
         
-        allowed = any(cmd_prefix.startswith(prefix.lower()) for prefix in self.allowed_prefixes)
+        base = self.base_path.resolve()
+        script = (cwd / parts[1]).resolve()
+        if not script.is_relative_to(base):
+            return None
         
-        if not allowed:
-            return False, f"Command '{parts[0]}' not allowed. Allowed: {', '.join(self.allowed_prefixes)}"
+        rel = script.relative_to(base).parts
+        if len(rel) < 2:
+            return None
+        skill = SkillLoader.load(base / rel[0])
+        if skill is None:
+            return None
+        allowed = skill.in_process.get("/".join(rel[1:]))
+        if not allowed or parts[2] not in allowed:
+            return None
         
-        # Check for dangerous patterns
-        dangerous_patterns = [
-            '&&', '||', ';', '|',  # Command chaining
-            '`', '$(',             # Command substitution
-            'rm -rf', 'rm -fr',    # Dangerous operations
-            '/etc/', '/root/',     # Sensitive paths
-        ]
+        module = self._load_script(script)
+        run = getattr(module, "run", None)
+        if not callable(run):
+            return None
+        return run, parts[2:]
+    
+    async def _execute_in_process(self, run: Callable, argv: List[str]) -> Optional[CommandResult]:
+        """
+        Call a script's run(argv) on a worker thread.
         
-        for pattern in dangerous_patterns:
-            if pattern in command:
-                # More nuanced check - only block if pattern is part of shell syntax
-                if pattern in ('&&', '||', ';', '|', '`', '$('):
-                    return False, f"Shell operators not allowed: {pattern}"
+        Returns None if the script tries to exit, so the caller can rerun it
+        as a subprocess and get the CLI's exact output.
+        """
+        try:
+            # A timed-out call can't be interrupted; its thread runs to completion
+            data = await asyncio.wait_for(asyncio.to_thread(_call_run, run, argv), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return CommandResult(
+                success=False,
+                stdout="",
+                stderr="",
+                return_code=-1,
+                error=f"Command timed out after {self.timeout} seconds"
+            )
+        except Exception as e:
+            logger.exception(f"In-process command error: {e}")
+            return CommandResult(
+                success=False,
+                stdout="",
+                stderr=f"{type(e).__name__}: {e}",
+                return_code=1
+            )
         
-        return True, ""
+        if data is None:
+            return None
+        
+        success = "error" not in data
+        return CommandResult(
+            success=success,
+            stdout=json.dumps(data),
+            stderr="",
+            return_code=0 if success else 1
+        )
     
     async def execute(
         self,
@@ -94,14 +251,14 @@ class SkillCommandExecutor:
         Execute a command securely.
         
         Args:
-            command: Shell command to execute
+            command: Command line, split shell-style and run without a shell
             working_dir: Optional subdirectory within base_path
         
         Returns:
             CommandResult with output and status
         """
         # Validate command
-        is_valid, error = self._validate_command(command)
+        is_valid, error, argv = self._validate_command(command)
         if not is_valid:
             return CommandResult(
                 success=False,
@@ -124,23 +281,40 @@ class SkillCommandExecutor:
                     error=f"Working directory not found: {working_dir}"
                 )
         
+        # Python skill scripts exposing run(argv) are called directly, skipping
+        # interpreter startup; sandboxed execution always uses a subprocess
+        if not self.sandbox:
+            resolved = self._resolve_in_process(argv, cwd)
+            if resolved:
+                logger.debug(f"Executing in-process: {command}")
+                result = await self._execute_in_process(*resolved)
+                if result is not None:
+                    return result
+        
         try:
             logger.debug(f"Executing command: {command} in {cwd}")
             
-            process = await asyncio.create_subprocess_shell(
-                command,
+            # Executed directly from the parsed argv; no /bin/sh in between
+            process = await asyncio.create_subprocess_exec(
+                *argv,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                cwd=str(cwd)
+                cwd=str(cwd),
+                # Own process group, so a timeout can kill the command's children too
+                start_new_session=_POSIX
             )
             
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
+                stdout_str, stderr_str, _ = await asyncio.wait_for(
+                    asyncio.gather(
+                        self._read_capped(process.stdout, self.max_output_bytes),
+                        self._read_capped(process.stderr, self.max_output_bytes),
+                        process.wait()
+                    ),
                     timeout=self.timeout
                 )
             except asyncio.TimeoutError:
-                process.kill()
+                self._kill(process)
                 await process.wait()
                 return CommandResult(
                     success=False,
@@ -150,9 +324,6 @@ class SkillCommandExecutor:
                     error=f"Command timed out after {self.timeout} seconds"
                 )
             
-            stdout_str = stdout.decode('utf-8', errors='replace').strip()
-            stderr_str = stderr.decode('utf-8', errors='replace').strip()
-            
             success = process.returncode == 0
             
             if not success:
@@ -165,6 +336,15 @@ class SkillCommandExecutor:
                 return_code=process.returncode
             )
         
+        except FileNotFoundError:
+            # What a shell would have reported, without a traceback in the logs
+            return CommandResult(
+                success=False,
+                stdout="",
+                stderr=f"{argv[0]}: command not found",
+                return_code=127
+            )
+        
         except Exception as e:
             logger.exception(f"Command execution error: {e}")
             return CommandResult(
@@ -2,8 +2,9 @@
 Central index of available skills.
 """
 
+import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from .loader import SkillLoader, SkillMetadata
 import logging
 
@@ -19,33 +20,44 @@ class SkillIndex:
     def __init__(self, base_path: Optional[str] = None):
         self._skills: Dict[str, SkillMetadata] = {}
         self._base_path = Path(base_path) if base_path else None
+        self._version = 0
+        # (version, summaries, summaries JSON), rebuilt when the index changes
+        self._summaries_cache: Optional[Tuple[int, List[Dict], str]] = None
     
     def set_base_path(self, path: str):
         """Set the skills base directory."""
         self._base_path = Path(path)
     
-    def discover(self):
-        """Scan base path and index all skills."""
+    def discover(self, max_workers: int = 1):
+        """
+        Scan base path and index all skills.
+        
+        max_workers > 1 loads skills on a thread pool, which helps cold
+        discovery of many skills.
+        """
         if not self._base_path:
             logger.warning("No base path set for skill discovery")
             return
         
         self._skills.clear()
-        skills = SkillLoader.discover(self._base_path)
+        skills = SkillLoader.discover(self._base_path, max_workers=max_workers)
         
         for skill in skills:
             self._skills[skill.name] = skill
+        self._version += 1
         
         logger.info(f"Indexed {len(self._skills)} skills")
     
     def register(self, skill: SkillMetadata):
         """Manually register a skill."""
         self._skills[skill.name] = skill
+        self._version += 1
     
     def unregister(self, name: str) -> bool:
         """Remove a skill from the index."""
         if name in self._skills:
             del self._skills[name]
+            self._version += 1
             return True
         return False
     
@@ -57,16 +69,33 @@ class SkillIndex:
         """List all indexed skills."""
         return list(self._skills.values())
     
+    def _summaries(self) -> Tuple[int, List[Dict], str]:
+        cache = self._summaries_cache
+        if cache is None or cache[0] != self._version:
+            summaries = [
+                {"name": s.name, "description": s.description}
+                for s in self._skills.values()
+            ]
+            cache = (self._version, summaries, json.dumps(summaries, indent=2))
+            self._summaries_cache = cache
+        return cache
+    
     def get_skill_summaries(self) -> List[Dict]:
         """Get summaries for system prompt inclusion."""
-        return [
-            {"name": s.name, "description": s.description}
-            for s in self._skills.values()
-        ]
+        return list(self._summaries()[1])
+    
+    def get_summaries_json(self) -> str:
+        """Skill summaries as indented JSON, cached until the index changes."""
+        return self._summaries()[2]
     
     @property
     def base_path(self) -> Optional[Path]:
         return self._base_path
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped on every change to the index, for cache invalidation."""
+        return self._version
 
 
 # Global skill index instance
@@ -2,16 +2,20 @@
 Parses SKILL.md files to extract skill metadata and documentation.
 """
 
-import frontmatter
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Parsed skills by directory: path -> ((mtime_ns, size, has_scripts_dir), metadata)
+_SKILL_CACHE: Dict[Path, Tuple[Tuple[int, int, bool], "SkillMetadata"]] = {}
 
-@dataclass
+
+@dataclass(slots=True)
 class SkillMetadata:
     """Parsed skill information."""
     name: str
@@ -19,6 +23,9 @@ class SkillMetadata:
     path: Path
     documentation: str  # Full SKILL.md content
     scripts_path: Optional[Path] = None
+    # Scripts (relative to the skill dir) whose run(argv) may be called
+    # in-process, mapped to the subcommands allowed that way
+    in_process: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
     
     @property
     def has_scripts(self) -> bool:
@@ -41,14 +48,25 @@ class SkillLoader:
         """
         skill_md_path = skill_path / "SKILL.md"
         
-        if not skill_md_path.exists():
+        try:
+            st = skill_md_path.stat()
+        except OSError:
             logger.warning(f"No SKILL.md found in {skill_path}")
             return None
         
+        # Unchanged skills are returned from cache without reparsing
+        scripts_path = skill_path / "scripts"
+        cache_key = (st.st_mtime_ns, st.st_size, scripts_path.exists())
+        cached = _SKILL_CACHE.get(skill_path)
+        if cached and cached[0] == cache_key:
+            return cached[1]
+        
         try:
-            # Parse frontmatter and content
-            with open(skill_md_path, 'r', encoding='utf-8') as f:
-                post = frontmatter.load(f)
+            # Full documentation (frontmatter + content), read once and parsed
+            full_doc = skill_md_path.read_text(encoding='utf-8')
+            # Imported on first parse: cached and skill-less runs never need it
+            import frontmatter
+            post = frontmatter.loads(full_doc)
             
             # Extract required fields
             name = post.get('name')
@@ -58,49 +76,84 @@ class SkillLoader:
             
             description = post.get('description', f"Skill: {name}")
             
-            # Full documentation (frontmatter + content)
-            full_doc = skill_md_path.read_text(encoding='utf-8')
-            
-            # Check for scripts directory
-            scripts_path = skill_path / "scripts"
-            if not scripts_path.exists():
-                scripts_path = None
-            
-            return SkillMetadata(
+            skill = SkillMetadata(
                 name=name,
                 description=description,
                 path=skill_path,
                 documentation=full_doc,
-                scripts_path=scripts_path
+                scripts_path=scripts_path if cache_key[2] else None,
+                in_process=SkillLoader._parse_in_process(post.get('in_process'), skill_path)
             )
+            _SKILL_CACHE[skill_path] = (cache_key, skill)
+            return skill
         
         except Exception as e:
             logger.error(f"Failed to load skill from {skill_path}: {e}")
             return None
     
     @staticmethod
-    def discover(base_path: Path) -> List[SkillMetadata]:
+    def _parse_in_process(value, skill_path: Path) -> Dict[str, Tuple[str, ...]]:
+        """
+        Parse the optional `in_process` frontmatter key:
+        
+            in_process:
+              scripts/calc.py: [calc, percent]
+        
+        Malformed values are ignored, leaving every command to a subprocess.
+        """
+        if value is None:
+            return {}
+        if isinstance(value, dict) and all(
+            isinstance(script, str) and isinstance(commands, list)
+            and all(isinstance(c, str) for c in commands)
+            for script, commands in value.items()
+        ):
+            return {script: tuple(commands) for script, commands in value.items()}
+        logger.warning(f"Ignoring malformed in_process in {skill_path / 'SKILL.md'}")
+        return {}
+    
+    @staticmethod
+    def _skill_dirs(base_path: Path) -> List[Path]:
+        """Non-hidden subdirectories of base_path, each a potential skill."""
+        # scandir entries know their type from the directory read, so only
+        # symlinks need a stat
+        with os.scandir(base_path) as entries:
+            return [
+                base_path / entry.name
+                for entry in entries
+                if entry.is_dir() and not entry.name.startswith('.')
+            ]
+    
+    @staticmethod
+    def discover(base_path: Path, max_workers: int = 1) -> List[SkillMetadata]:
         """
         Discover all skills in a directory.
         
         Args:
             base_path: Root directory to scan for skills
+            max_workers: Load skills on this many threads when above 1
         
         Returns:
             List of discovered skills
         """
-        skills = []
-        
         if not base_path.exists():
             logger.warning(f"Skills base path does not exist: {base_path}")
-            return skills
+            return []
+        
+        dirs = SkillLoader._skill_dirs(base_path)
+        if max_workers > 1 and len(dirs) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(dirs))) as pool:
+                loaded = list(pool.map(SkillLoader.load, dirs))
+        else:
+            loaded = [SkillLoader.load(d) for d in dirs]
         
-        # Each subdirectory is a potential skill
-        for item in base_path.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                skill = SkillLoader.load(item)
-                if skill:
-                    skills.append(skill)
-                    logger.info(f"Discovered skill: {skill.name}")
+        skills = [skill for skill in loaded if skill]
+        for skill in skills:
+            logger.info(f"Discovered skill: {skill.name}")
         
         return skills
+    
+    @staticmethod
+    def discover_parallel(base_path: Path, max_workers: int = 8) -> List[SkillMetadata]:
+        """Discover skills, parsing SKILL.md files on a thread pool."""
+        return SkillLoader.discover(base_path, max_workers=max_workers)
@@ -6,8 +6,8 @@ These tools enable skill reading and command execution.
 from ..registry import tool
 from ...skills.index import skill_index
 from ...skills.executor import SkillCommandExecutor
+from datetime import datetime
 from typing import Optional
-import json
 
 
 # Skill command executor instance (initialized in main.py)
@@ -24,7 +24,8 @@ def set_command_executor(executor: SkillCommandExecutor):
     name="get_current_time",
     description="Get the current date and time. Use this when the user asks what time it is or needs the current date.",
     timeout=5.0,
-    tags=["utility"]
+    tags=["utility"],
+    fast_sync=True
 )
 def get_current_time() -> str:
     """
@@ -33,7 +34,6 @@ def get_current_time() -> str:
     Returns:
         Current datetime as a formatted string
     """
-    from datetime import datetime
     now = datetime.now()
     return now.strftime("%I:%M %p on %A, %B %d, %Y")
 
@@ -42,7 +42,8 @@ def get_current_time() -> str:
     name="list_skills",
     description="List all available skills with their descriptions. Use this to discover what capabilities are available before attempting a task.",
     timeout=5.0,
-    tags=["system", "discovery"]
+    tags=["system", "discovery"],
+    fast_sync=True
 )
 def list_skills() -> str:
     """
@@ -51,18 +52,15 @@ def list_skills() -> str:
     Returns:
         JSON list of skills with name and description
     """
-    skills = skill_index.list_skills()
-    return json.dumps([
-        {"name": s.name, "description": s.description}
-        for s in skills
-    ], indent=2)
+    return skill_index.get_summaries_json()
 
 
 @tool(
     name="read_skill",
     description="Read the documentation for a specific skill. This returns the SKILL.md content which explains how to use the skill, including command formats and examples. ALWAYS read a skill's documentation before using it.",
     timeout=10.0,
-    tags=["system", "discovery"]
+    tags=["system", "discovery"],
+    fast_sync=True
 )
 def read_skill(skill_name: str) -> str:
     """
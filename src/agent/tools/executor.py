@@ -1,7 +1,8 @@
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 from dataclasses import dataclass
 from .registry import ToolRegistry, RegisteredTool
+from ..llm.base import ToolCall
 from ..resilience.circuit_breaker import CircuitBreaker, CircuitBreakerOpen
 import logging
 import traceback
@@ -10,7 +11,7 @@ import time
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Result of a tool execution."""
     tool_call_id: str
@@ -18,7 +19,7 @@ class ToolResult:
     success: bool
     result: Any
     error: Optional[str] = None
-    execution_time_ms: float = 0
+    execution_time_ms: float = 0  # measured with the monotonic perf_counter
     
     def to_message_content(self) -> str:
         """Format result for LLM consumption."""
@@ -42,13 +43,17 @@ class ToolExecutor:
         registry: ToolRegistry,
         default_timeout: float = 30.0,
         circuit_breaker_threshold: int = 5,
-        circuit_breaker_timeout: int = 60
+        circuit_breaker_timeout: int = 60,
+        max_parallel: int = 8
     ):
         self.registry = registry
         self.default_timeout = default_timeout
         self._circuit_breakers: Dict[str, CircuitBreaker] = {}
         self._cb_threshold = circuit_breaker_threshold
         self._cb_timeout = circuit_breaker_timeout
+        # Caps in-flight tool calls so a large fan-out doesn't flood the
+        # default thread pool used for sync tools
+        self._sem = asyncio.Semaphore(max_parallel)
     
     def _get_circuit_breaker(self, tool_name: str) -> CircuitBreaker:
         """Get or create circuit breaker for a tool."""
@@ -67,8 +72,6 @@ class ToolExecutor:
         arguments: Dict[str, Any]
     ) -> ToolResult:
         """Execute a single tool call with all protections."""
-        start_time = time.time()
-        
         # Get tool from registry
         tool = self.registry.get(tool_name)
         if not tool:
@@ -77,7 +80,7 @@ class ToolExecutor:
                 tool_name=tool_name,
                 success=False,
                 result=None,
-                error=f"Unknown tool: '{tool_name}'. Available tools: {', '.join(self.registry.list_names())}"
+                error=f"Unknown tool: '{tool_name}'. Available tools: {self.registry.names_str()}"
             )
         
         if not tool.enabled:
@@ -102,84 +105,79 @@ class ToolExecutor:
                 error=f"Tool '{tool_name}' is temporarily unavailable due to repeated failures. It will be retried automatically."
             )
         
-        # Execute with timeout
-        try:
-            timeout = tool.timeout or self.default_timeout
+        # Execute with timeout, once a concurrency slot is free; time spent
+        # queued counts toward neither the timeout nor execution_time_ms
+        async with self._sem:
+            start_ns = time.perf_counter_ns()
             
-            if tool.is_async:
-                result = await asyncio.wait_for(
-                    tool.func(**arguments),
-                    timeout=timeout
+            try:
+                timeout = tool.timeout or self.default_timeout
+                
+                if tool.fast_sync:
+                    # Called directly: its invoker would only add a coroutine
+                    result = tool.func(**arguments)
+                else:
+                    result = await tool.invoker(arguments, timeout)
+                
+                cb.record_success()
+                execution_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+                
+                return ToolResult(
+                    tool_call_id=tool_call_id,
+                    tool_name=tool_name,
+                    success=True,
+                    result=result,
+                    execution_time_ms=execution_time
                 )
-            else:
-                # Run sync function in thread pool
-                loop = asyncio.get_event_loop()
-                result = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        None,
-                        lambda: tool.func(**arguments)
-                    ),
-                    timeout=timeout
-                )
-            
-            cb.record_success()
-            execution_time = (time.time() - start_time) * 1000
             
-            return ToolResult(
-                tool_call_id=tool_call_id,
-                tool_name=tool_name,
-                success=True,
-                result=result,
-                execution_time_ms=execution_time
-            )
-        
-        except asyncio.TimeoutError:
-            cb.record_failure()
-            execution_time = (time.time() - start_time) * 1000
-            logger.warning(f"Tool '{tool_name}' timed out after {timeout}s")
-            
-            return ToolResult(
-                tool_call_id=tool_call_id,
-                tool_name=tool_name,
-                success=False,
-                result=None,
-                error=f"Tool '{tool_name}' timed out after {timeout} seconds",
-                execution_time_ms=execution_time
-            )
-        
-        except Exception as e:
-            cb.record_failure()
-            execution_time = (time.time() - start_time) * 1000
-            logger.exception(f"Tool '{tool_name}' failed with error: {e}")
+            except asyncio.TimeoutError:
+                cb.record_failure()
+                execution_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+                logger.warning(f"Tool '{tool_name}' timed out after {timeout}s")
+                
+                return ToolResult(
+                    tool_call_id=tool_call_id,
+                    tool_name=tool_name,
+                    success=False,
+                    result=None,
+                    error=f"Tool '{tool_name}' timed out after {timeout} seconds",
+                    execution_time_ms=execution_time
+                )
             
-            return ToolResult(
-                tool_call_id=tool_call_id,
-                tool_name=tool_name,
-                success=False,
-                result=None,
-                error=f"Tool execution error: {str(e)}",
-                execution_time_ms=execution_time
-            )
+            except Exception as e:
+                cb.record_failure()
+                execution_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+                logger.exception(f"Tool '{tool_name}' failed with error: {e}")
+                
+                return ToolResult(
+                    tool_call_id=tool_call_id,
+                    tool_name=tool_name,
+                    success=False,
+                    result=None,
+                    error=f"Tool execution error: {str(e)}",
+                    execution_time_ms=execution_time
+                )
     
     async def execute_parallel(
         self,
-        tool_calls: List[Dict[str, Any]]
+        tool_calls: Sequence[ToolCall]
     ) -> List[ToolResult]:
         """
         Execute multiple tool calls in parallel.
         
         Args:
-            tool_calls: List of dicts with 'id', 'name', 'input' keys
+            tool_calls: ToolCall objects as parsed from the LLM response
         """
-        tasks = [
-            self.execute(
-                tool_call_id=tc["id"],
-                tool_name=tc["name"],
-                arguments=tc.get("input", {})
-            )
-            for tc in tool_calls
-        ]
-        return await asyncio.gather(*tasks)
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(self.execute(
+                    tool_call_id=tc.id,
+                    tool_name=tc.name,
+                    arguments=tc.input
+                ))
+                for tc in tool_calls
+            ]
+        return [task.result() for task in tasks]
     
     def get_circuit_breaker_status(self) -> Dict[str, str]:
         """Get status of all circuit breakers."""
@@ -1,13 +1,35 @@
-from typing import Callable, Dict, Optional, List, Any
+from typing import Awaitable, Callable, Dict, Optional, List, Any, Set
+from collections import defaultdict
 from dataclasses import dataclass, field
 from .schema import ToolSchema, function_to_schema
 import asyncio
+import itertools
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
+# Calls a tool with (arguments, timeout) and returns its result
+Invoker = Callable[[Dict[str, Any], float], Awaitable[Any]]
 
-@dataclass
+
+def _make_invoker(func: Callable, is_async: bool, fast_sync: bool) -> Invoker:
+    """Pick the call path for a tool once, instead of branching per call."""
+    if is_async:
+        def invoke(arguments, timeout):
+            return asyncio.wait_for(func(**arguments), timeout=timeout)
+    elif fast_sync:
+        # Trivial sync tool: no thread-pool hop (or timeout)
+        async def invoke(arguments, timeout):
+            return func(**arguments)
+    else:
+        # Run sync function in thread pool
+        def invoke(arguments, timeout):
+            return asyncio.wait_for(asyncio.to_thread(func, **arguments), timeout=timeout)
+    return invoke
+
+
+@dataclass(slots=True)
 class RegisteredTool:
     """A registered tool with its metadata."""
     name: str
@@ -18,6 +40,13 @@ class RegisteredTool:
     timeout: float = 30.0
     tags: List[str] = field(default_factory=list)
     enabled: bool = True
+    fast_sync: bool = False  # sync tool cheap enough to run on the event loop
+    schema_dict: Dict = field(default_factory=dict)  # schema.as_dict
+    invoker: Optional[Invoker] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.invoker is None:
+            self.invoker = _make_invoker(self.func, self.is_async, self.fast_sync)
 
 
 class ToolRegistry:
@@ -28,30 +57,52 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: Dict[str, RegisteredTool] = {}
+        # Tag -> tool names, so tag filters don't scan every tool
+        self._by_tag: Dict[str, Set[str]] = defaultdict(set)
+        # Registration sequence per name, to list tag matches in registry order
+        self._order: Dict[str, int] = {}
+        self._counter = itertools.count()
+        # ", "-joined enabled tool names, reset whenever the listing changes
+        self._names_str_cache: Optional[str] = None
+    
+    def _index(self, tool: RegisteredTool):
+        for tag in tool.tags:
+            self._by_tag[tag].add(tool.name)
+    
+    def _unindex(self, tool: RegisteredTool):
+        for tag in tool.tags:
+            names = self._by_tag.get(tag)
+            if names is not None:
+                names.discard(tool.name)
+                if not names:
+                    del self._by_tag[tag]
     
     def tool(
         self,
         name: Optional[str] = None,
         description: Optional[str] = None,
         timeout: float = 30.0,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        fast_sync: bool = False
     ) -> Callable:
         """
         Decorator for registering a function as a tool.
         
+        Sync tools run in the default thread pool; fast_sync=True calls them
+        inline on the event loop instead, for trivial non-blocking tools.
+        The tool's timeout cannot interrupt an inline call.
+        
         Example:
             @registry.tool(name="search", description="Search the web")
             async def web_search(query: str) -> str:
                 ...
         """
         def decorator(func: Callable) -> Callable:
-            tool_name = name or func.__name__
+            # Interned so registry lookups and event payloads share one object
+            tool_name = sys.intern(name or func.__name__)
+            # function_to_schema applies the description override
             schema = function_to_schema(func, name_override=tool_name, description_override=description)
             
-            # Override description if provided
-            if description:
-                schema.description = description
-            
             registered = RegisteredTool(
                 name=tool_name,
                 description=schema.description,
@@ -59,10 +110,18 @@ class ToolRegistry:
                 schema=schema,
                 is_async=asyncio.iscoroutinefunction(func),
                 timeout=timeout,
-                tags=tags or []
+                tags=tags or [],
+                fast_sync=fast_sync,
+                schema_dict=schema.as_dict
             )
             
+            if previous := self._tools.get(tool_name):
+                self._unindex(previous)
+            else:
+                self._order[tool_name] = next(self._counter)
             self._tools[tool_name] = registered
+            self._index(registered)
+            self._names_str_cache = None
             logger.debug(f"Registered tool: {tool_name}")
             
             return func
@@ -75,15 +134,18 @@ class ToolRegistry:
         name: Optional[str] = None,
         description: Optional[str] = None,
         timeout: float = 30.0,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        fast_sync: bool = False
     ):
         """Programmatically register a tool."""
-        self.tool(name=name, description=description, timeout=timeout, tags=tags)(func)
+        self.tool(name=name, description=description, timeout=timeout, tags=tags, fast_sync=fast_sync)(func)
     
     def unregister(self, name: str) -> bool:
         """Remove a tool from the registry."""
         if name in self._tools:
-            del self._tools[name]
+            self._unindex(self._tools.pop(name))
+            del self._order[name]
+            self._names_str_cache = None
             logger.debug(f"Unregistered tool: {name}")
             return True
         return False
@@ -95,32 +157,42 @@ class ToolRegistry:
     def get_schema(self, name: str) -> Optional[Dict]:
         """Get a tool's schema by name."""
         tool = self._tools.get(name)
-        return tool.schema.to_dict() if tool else None
+        return tool.schema_dict if tool else None
     
     def list_tools(self, tags: Optional[List[str]] = None) -> List[RegisteredTool]:
         """List all registered tools, optionally filtered by tags."""
-        tools = list(self._tools.values())
-        if tags:
-            tools = [t for t in tools if any(tag in t.tags for tag in tags)]
+        if not tags:
+            return [t for t in self._tools.values() if t.enabled]
+        
+        names = set().union(*(self._by_tag.get(tag, ()) for tag in tags))
+        tools = [self._tools[n] for n in sorted(names, key=self._order.__getitem__)]
         return [t for t in tools if t.enabled]
     
     def list_schemas(self, tags: Optional[List[str]] = None) -> List[Dict]:
         """Get all tool schemas for LLM consumption."""
-        return [t.schema.to_dict() for t in self.list_tools(tags=tags)]
+        return [t.schema_dict for t in self.list_tools(tags=tags)]
     
     def list_names(self) -> List[str]:
         """Get names of all registered tools."""
         return [t.name for t in self.list_tools()]
     
+    def names_str(self) -> str:
+        """Enabled tool names joined with ", ", cached until the registry changes."""
+        if self._names_str_cache is None:
+            self._names_str_cache = ", ".join(self.list_names())
+        return self._names_str_cache
+    
     def enable(self, name: str):
         """Enable a tool."""
         if tool := self._tools.get(name):
             tool.enabled = True
+            self._names_str_cache = None
     
     def disable(self, name: str):
         """Disable a tool without unregistering."""
         if tool := self._tools.get(name):
             tool.enabled = False
+            self._names_str_cache = None
 
 
 # Global registry instance
@@ -132,7 +204,8 @@ def tool(
     name: str = None,
     description: str = None,
     timeout: float = 30.0,
-    tags: List[str] = None
+    tags: List[str] = None,
+    fast_sync: bool = False
 ):
     """Decorator for registering tools to the global registry."""
-    return registry.tool(name=name, description=description, timeout=timeout, tags=tags)
+    return registry.tool(name=name, description=description, timeout=timeout, tags=tags, fast_sync=fast_sync)
@@ -1,6 +1,8 @@
+import functools
 import inspect
-from typing import Callable, Dict, Any, get_type_hints, Optional, List, Union
-from dataclasses import dataclass
+from typing import Annotated, Callable, Dict, Any, get_origin, get_type_hints, Optional, List, Tuple, Union
+from dataclasses import dataclass, field
+from weakref import WeakKeyDictionary
 import re
 
 
@@ -15,13 +17,40 @@ TYPE_MAP = {
     type(None): "null",
 }
 
+# Generic alias origin (List[int].__origin__ is list, ...) to JSON Schema type
+_ORIGIN_MAP = {
+    list: "array",
+    tuple: "array",
+    set: "array",
+    frozenset: "array",
+    dict: "object",
+}
+
+# Per-function (main_description, parameters), computed once; the
+# parameters dict is shared by every schema built for the function
+_SCHEMA_CACHE: "WeakKeyDictionary[Callable, Tuple[str, Dict[str, Any]]]" = WeakKeyDictionary()
+
+# Google style: "param_name: description" or "param_name (type): description"
+_GOOGLE_RE = re.compile(r'^\s*(\w+)(?:\s*\([^)]+\))?:\s*(.+)$')
+
+# Sphinx style: ":param param_name: description"
+_SPHINX_RE = re.compile(r':param\s+(\w+):\s*(.+)')
+
+_SECTION_HEADERS = frozenset({'args:', 'arguments:', 'parameters:'})
+_SECTION_ENDS = frozenset({'returns:', 'raises:', 'example:', 'examples:'})
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ToolSchema:
     """Represents a tool's schema for LLM consumption."""
     name: str
     description: str
     parameters: Dict[str, Any]
+    # The to_dict() form, built once and shared; treat as read-only
+    as_dict: Dict = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "as_dict", self.to_dict())
     
     def to_dict(self) -> Dict:
         return {
@@ -31,22 +60,17 @@ class ToolSchema:
         }
 
 
+@functools.lru_cache(maxsize=256)
 def parse_docstring(docstring: str) -> Dict[str, str]:
     """
     Parse parameter descriptions from docstring.
-    Supports Google and Sphinx styles.
+    Supports Google and Sphinx styles. Results are cached; don't mutate them.
     """
     if not docstring:
         return {}
     
     params = {}
     
-    # Google style: "param_name: description" or "param_name (type): description"
-    google_pattern = r'^\s*(\w+)(?:\s*\([^)]+\))?:\s*(.+)$'
-    
-    # Sphinx style: ":param param_name: description"
-    sphinx_pattern = r':param\s+(\w+):\s*(.+)'
-    
     lines = docstring.split('\n')
     in_args_section = False
     
@@ -54,39 +78,42 @@ def parse_docstring(docstring: str) -> Dict[str, str]:
         stripped = line.strip()
         
         # Check for Args: section (Google style)
-        if stripped.lower() in ('args:', 'arguments:', 'parameters:'):
+        if stripped.lower() in _SECTION_HEADERS:
             in_args_section = True
             continue
         
         # Check for section end
-        if stripped.lower() in ('returns:', 'raises:', 'example:', 'examples:'):
+        if stripped.lower() in _SECTION_ENDS:
             in_args_section = False
             continue
         
-        # Sphinx style
-        sphinx_match = re.match(sphinx_pattern, stripped)
-        if sphinx_match:
-            params[sphinx_match.group(1)] = sphinx_match.group(2).strip()
+        # Both parameter styles need a colon; prose lines stop here
+        if ':' not in stripped:
             continue
         
+        # Sphinx style
+        if stripped.startswith(':param'):
+            sphinx_match = _SPHINX_RE.match(stripped)
+            if sphinx_match:
+                params[sphinx_match.group(1)] = sphinx_match.group(2).strip()
+                continue
+        
         # Google style (only in args section)
-        if in_args_section:
-            google_match = re.match(google_pattern, stripped)
+        elif in_args_section:
+            google_match = _GOOGLE_RE.match(stripped)
             if google_match:
                 params[google_match.group(1)] = google_match.group(2).strip()
     
     return params
 
 
+@functools.lru_cache(maxsize=512)
 def get_json_type(python_type: Any) -> str:
-    """Convert Python type to JSON Schema type string."""
-    # Handle None type
-    if python_type is type(None):
-        return "null"
-    
-    # Handle basic types
-    if python_type in TYPE_MAP:
-        return TYPE_MAP[python_type]
+    """Convert Python type to JSON Schema type string (memoized per type)."""
+    # Handle basic types (including None)
+    json_type = TYPE_MAP.get(python_type)
+    if json_type is not None:
+        return json_type
     
     # Handle generic types (List, Dict, Optional, etc.)
     origin = getattr(python_type, '__origin__', None)
@@ -99,14 +126,8 @@ def get_json_type(python_type: Any) -> str:
             return get_json_type(non_none_args[0])
         return "string"  # Default for complex unions
     
-    if origin is list:
-        return "array"
-    
-    if origin is dict:
-        return "object"
-    
-    # Default to string for unknown types
-    return "string"
+    # Containers by origin; string for unknown types
+    return _ORIGIN_MAP.get(origin, "string")
 
 
 def function_to_schema(
@@ -118,12 +139,42 @@ def function_to_schema(
     Auto-generate JSON Schema from a Python function.
     Uses type hints and docstring for schema generation.
     """
+    try:
+        cached = _SCHEMA_CACHE.get(func)
+    except TypeError:  # not weak-referenceable
+        cached = None
+    
+    if cached is None:
+        cached = _compute_schema(func)
+        try:
+            _SCHEMA_CACHE[func] = cached
+        except TypeError:
+            pass
+    
+    main_description, parameters = cached
+    return ToolSchema(
+        name=name_override or func.__name__,
+        description=description_override or main_description or func.__name__,
+        parameters=parameters
+    )
+
+
+def _compute_schema(func: Callable) -> Tuple[str, Dict[str, Any]]:
+    """Introspect func once: its main description and parameters schema."""
     sig = inspect.signature(func)
     
-    try:
-        hints = get_type_hints(func)
-    except Exception:
-        hints = {}
+    # Annotations are usually real types, read straight off the signature;
+    # get_type_hints (which evals strings) is only needed for string or
+    # PEP 563 annotations, and to strip Annotated extras
+    hints = None
+    if any(
+        isinstance(p.annotation, str) or get_origin(p.annotation) is Annotated
+        for p in sig.parameters.values()
+    ):
+        try:
+            hints = get_type_hints(func)
+        except Exception:
+            hints = {}
     
     docstring = inspect.getdoc(func) or ""
     
@@ -143,7 +194,12 @@ def function_to_schema(
             continue
         
         # Get type
-        param_type = hints.get(param_name, str)
+        if hints is not None:
+            param_type = hints.get(param_name, str)
+        elif param.annotation is inspect.Parameter.empty:
+            param_type = str
+        else:
+            param_type = param.annotation
         
         # Get JSON type
         json_type = get_json_type(param_type)
@@ -173,12 +229,8 @@ def function_to_schema(
                 if type(None) not in args:
                     required.append(param_name)
     
-    return ToolSchema(
-        name=name_override or func.__name__,
-        description=description_override or main_description or func.__name__,
-        parameters={
-            "type": "object",
-            "properties": properties,
-            "required": required
-        }
-    )
+    return main_description, {
+        "type": "object",
+        "properties": properties,
+        "required": required
+    }
@@ -3,14 +3,38 @@ WebSocket connection management with heartbeat.
 """
 
 import asyncio
-from typing import Dict, Optional
+import json
+from typing import Any, Dict, Optional, Set, Tuple, Union
 from fastapi import WebSocket
-from datetime import datetime
+from datetime import datetime, timezone
+from .framing import binary_available, encode_binary
 import logging
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _json_text(data: Any) -> str:
+    """Encode a message as compact JSON text, the format Starlette's send_json uses."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; the stdlib encoder handles them
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+# Heartbeat ping, encoded once for both framings
+_PING = {"type": "ping"}
+_PING_TEXT = _json_text(_PING)
+_PING_FRAME = encode_binary(_PING) if binary_available() else b""
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections.
@@ -19,71 +43,105 @@ class ConnectionManager:
     - Connection tracking by client ID
     - Heartbeat for stale connection detection
     - Graceful disconnect handling
+    - Optional binary (msgpack) framing per client
     """
     
     def __init__(self, heartbeat_interval: int = 30):
         self.active_connections: Dict[str, WebSocket] = {}
+        # Client IDs as of the last connect/disconnect, iterated without copying
+        self._conn_snapshot: Tuple[str, ...] = ()
         self.heartbeat_interval = heartbeat_interval
-        self._heartbeat_tasks: Dict[str, asyncio.Task] = {}
-        self._connection_times: Dict[str, datetime] = {}
+        # One task pings every client; runs while any connection is open
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # (time.monotonic(), aware UTC datetime) at connect: the first for
+        # durations, the second for reporting when the client connected
+        self._connection_times: Dict[str, Tuple[float, datetime]] = {}
+        self._binary_clients: Set[str] = set()
     
-    async def connect(self, websocket: WebSocket, client_id: str):
+    async def connect(self, websocket: WebSocket, client_id: str, binary: bool = False):
         """Accept and track a new connection."""
         await websocket.accept()
         self.active_connections[client_id] = websocket
-        self._connection_times[client_id] = datetime.utcnow()
+        self._conn_snapshot = tuple(self.active_connections)
+        self._connection_times[client_id] = (time.monotonic(), datetime.now(timezone.utc))
+        if binary:
+            self._binary_clients.add(client_id)
         
-        # Start heartbeat task
-        self._heartbeat_tasks[client_id] = asyncio.create_task(
-            self._heartbeat_loop(client_id)
-        )
+        # Start the shared heartbeat unless it's already running on this loop
+        task = self._heartbeat_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
         
         logger.info(f"Client {client_id} connected. Total: {len(self.active_connections)}")
     
     def disconnect(self, client_id: str):
         """Remove a connection."""
-        self.active_connections.pop(client_id, None)
+        if self.active_connections.pop(client_id, None) is not None:
+            self._conn_snapshot = tuple(self.active_connections)
         self._connection_times.pop(client_id, None)
-        
-        if client_id in self._heartbeat_tasks:
-            self._heartbeat_tasks[client_id].cancel()
-            del self._heartbeat_tasks[client_id]
+        self._binary_clients.discard(client_id)
         
         logger.info(f"Client {client_id} disconnected. Total: {len(self.active_connections)}")
     
-    async def send_json(self, client_id: str, data: dict) -> bool:
-        """Send JSON message to a client."""
+    async def _send(self, client_id: str, payload: Union[str, bytes]) -> bool:
+        """Send an encoded payload: str as a text frame, bytes as binary."""
         websocket = self.active_connections.get(client_id)
         if not websocket:
             return False
         
         try:
-            await websocket.send_json(data)
+            if isinstance(payload, str):
+                await websocket.send_text(payload)
+            else:
+                await websocket.send_bytes(payload)
             return True
         except Exception as e:
             logger.error(f"Failed to send to {client_id}: {e}")
             self.disconnect(client_id)
             return False
     
+    async def send_json(self, client_id: str, data: dict) -> bool:
+        """Send JSON message to a client."""
+        # Text frame, so browser clients still get a string to JSON.parse
+        return await self._send(client_id, _json_text(data))
+    
+    async def send_message(self, client_id: str, data: dict) -> bool:
+        """Send a message using the framing the client connected with."""
+        if client_id in self._binary_clients:
+            return await self._send(client_id, encode_binary(data))
+        return await self.send_json(client_id, data)
+    
+    async def send_prepared(self, client_id: str, text: str, frame: bytes) -> bool:
+        """Send a message already encoded as JSON text and as a binary frame."""
+        return await self._send(client_id, frame if client_id in self._binary_clients else text)
+    
     async def broadcast(self, data: dict, exclude: Optional[str] = None):
-        """Send message to all connected clients."""
-        for client_id in list(self.active_connections.keys()):
-            if client_id != exclude:
-                await self.send_json(client_id, data)
+        """Send message to all connected clients concurrently, encoding it once."""
+        client_ids = self._conn_snapshot
+        if not client_ids or client_ids == (exclude,):
+            return
+        
+        text = _json_text(data)
+        frame = encode_binary(data) if self._binary_clients else b""
+        await asyncio.gather(
+            *(self.send_prepared(cid, text, frame) for cid in client_ids if cid != exclude),
+            return_exceptions=True
+        )
     
-    async def _heartbeat_loop(self, client_id: str):
-        """Send periodic pings to detect stale connections."""
-        while client_id in self.active_connections:
+    async def _heartbeat_loop(self):
+        """Send periodic pings to all clients to detect stale connections."""
+        while self.active_connections:
             try:
                 await asyncio.sleep(self.heartbeat_interval)
-                if client_id in self.active_connections:
-                    await self.send_json(client_id, {"type": "ping"})
+                # Failed sends disconnect their client inside _send
+                await asyncio.gather(
+                    *(self.send_prepared(cid, _PING_TEXT, _PING_FRAME) for cid in self._conn_snapshot),
+                    return_exceptions=True
+                )
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.debug(f"Heartbeat failed for {client_id}: {e}")
-                self.disconnect(client_id)
-                break
+                logger.debug(f"Heartbeat failed: {e}")
     
     def get_connection_count(self) -> int:
         """Get number of active connections."""
@@ -93,8 +151,10 @@ class ConnectionManager:
         """Get info about a connection."""
         if client_id not in self.active_connections:
             return None
+        connected = self._connection_times.get(client_id)
         return {
             "client_id": client_id,
-            "connected_at": self._connection_times.get(client_id),
+            "connected_at": connected[1] if connected else None,
+            "connected_seconds": time.monotonic() - connected[0] if connected else None,
             "active": True
         }
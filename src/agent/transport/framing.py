@@ -0,0 +1,44 @@
+"""
+Optional binary framing for server messages.
+
+Clients opt in by connecting with ?encoding=msgpack. Each binary frame is
+a one-byte opcode followed by the payload:
+
+- OP_TEXT_DELTA: the UTF-8 token text, with no envelope to parse
+- OP_MESSAGE: any other message dict, msgpack-encoded
+"""
+
+from typing import Any, Dict
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+OP_MESSAGE = 0x00
+OP_TEXT_DELTA = 0x01
+
+_MESSAGE_HEADER = bytes([OP_MESSAGE])
+_TEXT_DELTA_HEADER = bytes([OP_TEXT_DELTA])
+
+
+def binary_available() -> bool:
+    """Whether msgpack is installed, so binary framing can be offered."""
+    return msgpack is not None
+
+
+def encode_binary(message: Dict[str, Any]) -> bytes:
+    """Encode a server message as an opcode-prefixed binary frame."""
+    if message["type"] == "text_delta":
+        return _TEXT_DELTA_HEADER + (message.get("content") or "").encode()
+    return _MESSAGE_HEADER + msgpack.packb(message, use_bin_type=True)
+
+
+def decode_binary(frame: bytes) -> Dict[str, Any]:
+    """Decode a frame produced by encode_binary."""
+    opcode = frame[0]
+    if opcode == OP_TEXT_DELTA:
+        return {"type": "text_delta", "content": frame[1:].decode()}
+    if opcode == OP_MESSAGE:
+        return msgpack.unpackb(frame[1:], raw=False)
+    raise ValueError(f"Unknown frame opcode: {opcode:#04x}")
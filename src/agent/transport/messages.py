@@ -2,9 +2,34 @@
 WebSocket message schemas using Pydantic.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Literal, Any, Dict
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+import time
+
+
+@lru_cache(maxsize=1)
+def _iso_second(epoch_second: int) -> str:
+    """ISO-8601 date and time for a whole UTC second, up to the decimal point."""
+    return datetime.fromtimestamp(epoch_second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.")
+
+
+def utc_timestamp(epoch: Optional[float] = None) -> str:
+    """
+    UTC time as an ISO-8601 string, the wire format of `timestamp`.
+    
+    Formats `epoch` (seconds, as from time.time()), or the current time.
+    The date part is formatted once per second; each call only adds the
+    microseconds, which avoids building a datetime per message.
+    """
+    if epoch is None:
+        seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+        micros = nanos // 1000
+    else:
+        seconds = int(epoch)
+        micros = int((epoch - seconds) * 1_000_000)
+    return f"{_iso_second(seconds)}{micros:06d}"
 
 
 class ClientMessage(BaseModel):
@@ -12,7 +37,22 @@ class ClientMessage(BaseModel):
     type: Literal["chat", "ping", "reset", "switch_model"]
     content: Optional[str] = None
     data: Optional[Dict[str, Any]] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: float = Field(default_factory=time.time)  # epoch seconds
+    
+    @field_validator("timestamp", mode="before")
+    @classmethod
+    def _epoch_from_iso(cls, value: Any) -> Any:
+        """Accept ISO-8601 timestamps too; naive ones are taken as UTC."""
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return value  # numeric strings are still parsed as floats
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return value.timestamp()
+        return value
 
 
 class ServerMessage(BaseModel):
@@ -36,13 +76,13 @@ class ServerMessage(BaseModel):
     ]
     content: Optional[str] = None
     data: Optional[Dict[str, Any]] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: float = Field(default_factory=time.time)  # epoch seconds
     
     def to_json_dict(self) -> dict:
-        """Convert to JSON-serializable dict."""
+        """Convert to JSON-serializable dict, with an ISO-8601 timestamp."""
         return {
             "type": self.type,
             "content": self.content,
             "data": self.data,
-            "timestamp": self.timestamp.isoformat()
+            "timestamp": utc_timestamp(self.timestamp)
         }
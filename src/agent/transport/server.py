@@ -2,39 +2,44 @@
 FastAPI WebSocket server for the agent.
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
 import uuid
 import logging
 import os
 
 from .connection import ConnectionManager
-from .messages import ClientMessage, ServerMessage
+from .framing import binary_available
+from .messages import ClientMessage, utc_timestamp
 from ..core.agent import ReactAgent, AgentEvent
+from ..llm.base import BaseLLM
 from ..llm.factory import LLMFactory
 from ..tools.registry import registry as tool_registry
 from ..tools.builtin import core_tools
 from ..skills.index import skill_index
 from ..skills.executor import SkillCommandExecutor
-from ..config.settings import settings
+from ..config.settings import settings_snapshot
 
 logger = logging.getLogger(__name__)
 
 
 # Global instances
 connection_manager = ConnectionManager(
-    heartbeat_interval=settings.server.heartbeat_interval
+    heartbeat_interval=settings_snapshot.server.heartbeat_interval
 )
 agents: Dict[str, ReactAgent] = {}
 
 
+@lru_cache(maxsize=1)
 def load_system_prompt() -> str:
-    """Load system prompt from file or return default."""
+    """Load system prompt from file or return default. Read once per process."""
     try:
         with open("config/prompts/system_prompt.txt", "r") as f:
             return f.read()
@@ -68,18 +73,22 @@ async def lifespan(app: FastAPI):
     logger.info("Starting agent server...")
     
     # Initialize skill index
-    skill_index.set_base_path(settings.skills.base_path)
-    if settings.skills.auto_discover:
+    skill_index.set_base_path(settings_snapshot.skills.base_path)
+    if settings_snapshot.skills.auto_discover:
         skill_index.discover()
     
     # Initialize skill command executor
     command_executor = SkillCommandExecutor(
         base_path=skill_index.base_path,
-        allowed_prefixes=settings.skills.allowed_commands,
-        timeout=settings.skills.command_timeout
+        allowed_prefixes=settings_snapshot.skills.allowed_commands,
+        timeout=settings_snapshot.skills.command_timeout,
+        sandbox=settings_snapshot.skills.sandbox
     )
     core_tools.set_command_executor(command_executor)
     
+    # Read the prompt now rather than on the first connection
+    load_system_prompt()
+    
     logger.info(f"Loaded {len(skill_index.list_skills())} skills")
     logger.info(f"Loaded {len(tool_registry.list_names())} tools")
     
@@ -105,8 +114,9 @@ app.add_middleware(
 )
 
 # Determine frontend path (works both in dev and installed mode)
+@lru_cache(maxsize=1)
 def get_frontend_path() -> Path:
-    """Get the frontend directory path."""
+    """Get the frontend directory path. Resolved once per process."""
     # Try relative to current working directory first (for running from project root)
     cwd_path = Path.cwd() / "frontend"
     if cwd_path.exists():
@@ -125,64 +135,146 @@ frontend_path = get_frontend_path()
 print(f"Frontend path: {frontend_path} (exists: {frontend_path.exists()})")
 
 
-def create_agent() -> ReactAgent:
-    """Create a new agent instance."""
-    api_key = settings.llm.anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
+@lru_cache(maxsize=1)
+def get_shared_llm() -> BaseLLM:
+    """
+    The configured LLM, built on first use and shared by all connections.
     
-    llm = LLMFactory.from_config({
-        "provider": settings.llm.provider,
-        "model": settings.llm.model,
+    LLM adapters hold no conversation state, so one client (and its HTTP
+    connection pool) serves every agent. switch_model gives that agent its
+    own LLM instead of changing this one.
+    """
+    api_key = settings_snapshot.llm.anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
+    
+    return LLMFactory.from_config({
+        "provider": settings_snapshot.llm.provider,
+        "model": settings_snapshot.llm.model,
         "api_key": api_key,
-        "cache": {"enabled": settings.llm.cache.enabled},
-        "max_tokens": settings.llm.max_tokens,
-        "temperature": settings.llm.temperature,
+        "cache": {"enabled": settings_snapshot.llm.cache.enabled},
+        "max_tokens": settings_snapshot.llm.max_tokens,
+        "temperature": settings_snapshot.llm.temperature,
     })
-    
+
+
+def create_agent() -> ReactAgent:
+    """Create a new agent instance."""
     return ReactAgent(
-        llm=llm,
+        llm=get_shared_llm(),
         tool_registry=tool_registry,
         skill_index=skill_index,
         system_prompt=load_system_prompt(),
-        max_iterations=settings.agent.max_iterations
+        max_iterations=settings_snapshot.agent.max_iterations,
+        text_delta_window=settings_snapshot.agent.text_delta_window
     )
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+# Frontend file name -> ((mtime_ns, size), content, ETag)
+_static_files: Dict[str, Tuple[Tuple[int, int], bytes, str]] = {}
+
+
+def _static_file(request: Request, name: str, media_type: str) -> Optional[Response]:
+    """
+    Serve a frontend file from memory, rereading it when it changes.
+    
+    The frontend is a few small files, so keeping their bytes costs one
+    stat per request instead of an open and read; edits (e.g. under
+    uvicorn --reload, which only watches .py files) show up on the next
+    request. Answers 304 when the client already has the current ETag.
+    Returns None (and caches nothing) if the file doesn't exist.
+    """
+    path = get_frontend_path() / name
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _static_files.get(name)
+    if cached is None or cached[0] != key:
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        etag = f'"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+        cached = (key, content, etag)
+        _static_files[name] = cached
+    
+    _, content, etag = cached
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    # A fresh Response each time: middleware may add headers in place
+    return Response(content=content, media_type=media_type, headers={"ETag": etag})
+
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the frontend."""
+    response = _static_file(request, "index.html", "text/html")
+    if response is not None:
+        return response
     fp = get_frontend_path()
-    frontend_file = fp / "index.html"
-    if frontend_file.exists():
-        return FileResponse(str(frontend_file))
     return {"message": "Autonomous Agent API", "docs": "/docs", "frontend_path": str(fp), "exists": fp.exists()}
 
 
 @app.get("/styles.css")
-async def styles():
+async def styles(request: Request):
     """Serve CSS."""
-    fp = get_frontend_path()
-    css_file = fp / "styles.css"
-    if css_file.exists():
-        return FileResponse(str(css_file), media_type="text/css")
+    response = _static_file(request, "styles.css", "text/css")
+    if response is not None:
+        return response
     return {"error": "styles.css not found"}
 
 
 @app.get("/app.js")
-async def app_js():
+async def app_js(request: Request):
     """Serve JavaScript."""
-    fp = get_frontend_path()
-    js_file = fp / "app.js"
-    if js_file.exists():
-        return FileResponse(str(js_file), media_type="application/javascript")
+    response = _static_file(request, "app.js", "application/javascript")
+    if response is not None:
+        return response
     return {"error": "app.js not found"}
 
 
+async def _emit(
+    client_id: str,
+    type_: str,
+    content: Optional[str] = None,
+    data: Optional[Dict[str, Any]] = None
+) -> bool:
+    """
+    Send a server message in the ServerMessage wire format.
+    
+    Builds the dict directly: the server trusts its own message types, so
+    validating a ServerMessage model per streamed token is pure overhead.
+    """
+    return await connection_manager.send_message(client_id, {
+        "type": type_,
+        "content": content,
+        "data": data,
+        "timestamp": utc_timestamp()
+    })
+
+
 @app.websocket("/chat")
 async def chat_websocket(websocket: WebSocket):
-    """Main WebSocket endpoint for chat."""
+    """
+    Main WebSocket endpoint for chat.
+    Connect with ?encoding=msgpack to receive binary frames (see framing.py).
+    """
     client_id = str(uuid.uuid4())
+    binary = websocket.query_params.get("encoding") == "msgpack" and binary_available()
     
-    await connection_manager.connect(websocket, client_id)
+    await connection_manager.connect(websocket, client_id, binary=binary)
     
     # Create agent for this connection
     agent = create_agent()
@@ -190,40 +282,43 @@ async def chat_websocket(websocket: WebSocket):
     
     try:
         # Send connection confirmation
-        await connection_manager.send_json(client_id, ServerMessage(
-            type="connected",
+        await _emit(
+            client_id, "connected",
             data={
                 "client_id": client_id,
-                "model": f"{settings.llm.provider}/{settings.llm.model}"
+                "model": f"{settings_snapshot.llm.provider}/{settings_snapshot.llm.model}"
             }
-        ).to_json_dict())
+        )
         
         while True:
             raw_data = await websocket.receive_json()
             
+            # Pings and resets carry nothing to validate; handle them before
+            # building a model, which only chat and switch_model need
+            msg_type = raw_data.get("type") if isinstance(raw_data, dict) else None
+            if msg_type == "ping":
+                await _emit(client_id, "pong")
+                continue
+            
+            if msg_type == "reset":
+                agent.reset()
+                await _emit(
+                    client_id, "status",
+                    content="Conversation reset"
+                )
+                continue
+            
             try:
-                message = ClientMessage(**raw_data)
+                message = ClientMessage.model_validate(raw_data)
             except Exception as e:
-                await connection_manager.send_json(client_id, ServerMessage(
-                    type="error",
+                await _emit(
+                    client_id, "error",
                     content=f"Invalid message format: {e}"
-                ).to_json_dict())
+                )
                 continue
             
             # Handle different message types
-            if message.type == "ping":
-                await connection_manager.send_json(client_id, ServerMessage(
-                    type="pong"
-                ).to_json_dict())
-            
-            elif message.type == "reset":
-                agent.reset()
-                await connection_manager.send_json(client_id, ServerMessage(
-                    type="status",
-                    content="Conversation reset"
-                ).to_json_dict())
-            
-            elif message.type == "switch_model":
+            if message.type == "switch_model":
                 # Hot-swap model
                 if message.data and "provider" in message.data and "model" in message.data:
                     try:
@@ -234,34 +329,34 @@ async def chat_websocket(websocket: WebSocket):
                             api_key=api_key
                         )
                         agent.update_llm(new_llm)
-                        await connection_manager.send_json(client_id, ServerMessage(
-                            type="model_switched",
+                        await _emit(
+                            client_id, "model_switched",
                             data={
                                 "provider": message.data["provider"],
                                 "model": message.data["model"]
                             }
-                        ).to_json_dict())
+                        )
                     except Exception as e:
-                        await connection_manager.send_json(client_id, ServerMessage(
-                            type="error",
+                        await _emit(
+                            client_id, "error",
                             content=f"Failed to switch model: {e}"
-                        ).to_json_dict())
+                        )
             
             elif message.type == "chat" and message.content:
                 # Process chat message with streaming
                 try:
                     async for event in agent.process_stream(message.content):
-                        await connection_manager.send_json(client_id, ServerMessage(
-                            type=event.type,
-                            content=event.data.get("content"),
-                            data={k: v for k, v in event.data.items() if k != "content"}
-                        ).to_json_dict())
+                        await _emit(
+                            client_id, event.type,
+                            content=event.content,
+                            data=event.data
+                        )
                 except Exception as e:
                     logger.exception(f"Agent processing error: {e}")
-                    await connection_manager.send_json(client_id, ServerMessage(
-                        type="error",
+                    await _emit(
+                        client_id, "error",
                         content=f"Processing error: {str(e)}"
-                    ).to_json_dict())
+                    )
     
     except WebSocketDisconnect:
         logger.info(f"Client {client_id} disconnected normally")
@@ -289,8 +384,8 @@ async def server_info():
     return {
         "version": "0.1.0",
         "llm": {
-            "provider": settings.llm.provider,
-            "model": settings.llm.model
+            "provider": settings_snapshot.llm.provider,
+            "model": settings_snapshot.llm.model
         },
         "skills": [
             {"name": s.name, "description": s.description}
@@ -0,0 +1,90 @@
+"""Tests for the agent core."""
+
+import asyncio
+import pytest
+from agent.core.agent import coalesce_text_deltas
+from agent.llm.base import StreamChunk
+
+
+def delta(text: str) -> StreamChunk:
+    return StreamChunk(type="text_delta", content=text)
+
+
+async def collect(chunks, window: float):
+    return [(c.type, c.content) async for c in coalesce_text_deltas(chunks, window)]
+
+
+def test_coalesce_merges_and_preserves_order():
+    """Test that deltas merge within the window and other chunks flush them."""
+    async def stream():
+        yield delta("a")
+        yield delta("b")
+        yield StreamChunk(type="done")
+        yield delta("c")
+
+    result = asyncio.run(collect(stream(), window=1.0))
+    assert result == [("text_delta", "ab"), ("done", ""), ("text_delta", "c")]
+
+
+def test_coalesce_window_expiry():
+    """Test that text pending past the window is flushed before later deltas."""
+    async def stream():
+        yield delta("a")
+        await asyncio.sleep(0.1)
+        yield delta("b")
+
+    result = asyncio.run(collect(stream(), window=0.01))
+    assert result == [("text_delta", "a"), ("text_delta", "b")]
+
+
+def test_coalesce_zero_window_passthrough():
+    """Test that a zero window passes every chunk through unchanged."""
+    chunks = [delta("a"), delta("b"), StreamChunk(type="done")]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        return [c async for c in coalesce_text_deltas(stream(), 0)]
+
+    assert asyncio.run(run()) == chunks
+
+
+def test_coalesce_early_aclose():
+    """Test that closing early cancels the in-flight read of the inner stream."""
+    closed = []
+
+    async def stream():
+        try:
+            yield delta("a")
+            await asyncio.Event().wait()  # never produces another chunk
+        finally:
+            closed.append(True)
+
+    async def run():
+        gen = coalesce_text_deltas(stream(), 0.01)
+        first = await gen.__anext__()
+        await gen.aclose()
+        return first.content, len(asyncio.all_tasks())
+
+    assert asyncio.run(run()) == ("a", 1)
+    assert closed == [True]
+
+
+def test_coalesce_flushes_before_error():
+    """Test that buffered text is yielded before an inner stream error."""
+    received = []
+
+    async def stream():
+        yield delta("a")
+        yield delta("b")
+        raise RuntimeError("connection lost")
+
+    async def run():
+        async for chunk in coalesce_text_deltas(stream(), 1.0):
+            received.append(chunk.content)
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        asyncio.run(run())
+    assert received == ["ab"]
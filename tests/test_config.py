@@ -0,0 +1,28 @@
+"""Tests for configuration."""
+
+import dataclasses
+import typing
+import pytest
+from agent.config.settings import SNAPSHOT_CLASSES, Settings, SettingsSnapshot
+
+
+@pytest.mark.parametrize("model_cls", list(SNAPSHOT_CLASSES))
+def test_snapshot_fields_match_models(model_cls):
+    """Test that each snapshot dataclass declares its model's fields and types."""
+    snapshot_cls = SNAPSHOT_CLASSES[model_cls]
+    hints = typing.get_type_hints(snapshot_cls)
+    
+    assert list(hints) == list(model_cls.model_fields)
+    for name, field in model_cls.model_fields.items():
+        expected = SNAPSHOT_CLASSES.get(field.annotation, field.annotation)
+        assert hints[name] == expected, name
+
+
+def test_settings_snapshot_is_frozen():
+    """Test that snapshots copy nested settings and reject writes."""
+    snapshot = Settings().snapshot()
+    
+    assert isinstance(snapshot, SettingsSnapshot)
+    assert snapshot.llm.cache.enabled == Settings().llm.cache.enabled
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.server.port = 1
@@ -0,0 +1,47 @@
+"""Tests for the HTTP endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+from agent.transport import server
+from agent.transport.server import app
+
+
+@pytest.mark.parametrize("path", ["/", "/styles.css", "/app.js"])
+def test_static_file_etag(path):
+    """Test that frontend files carry an ETag and revalidate with 304."""
+    client = TestClient(app)
+    
+    response = client.get(path)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.content
+    
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+    
+    weak = client.get(path, headers={"If-None-Match": f'"stale", W/{etag}'})
+    assert weak.status_code == 304
+    
+    stale = client.get(path, headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == response.content
+
+
+def test_static_file_picks_up_edits(tmp_path, monkeypatch):
+    """Test that an edited frontend file is served fresh with a new ETag."""
+    monkeypatch.setattr(server, "get_frontend_path", lambda: tmp_path)
+    monkeypatch.setattr(server, "_static_files", {})
+    client = TestClient(app)
+    app_js = tmp_path / "app.js"
+    
+    app_js.write_text("console.log(1);")
+    first = client.get("/app.js")
+    assert first.text == "console.log(1);"
+    
+    app_js.write_text("console.log(22);")
+    second = client.get("/app.js", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.text == "console.log(22);"
+    assert second.headers["etag"] != first.headers["etag"]
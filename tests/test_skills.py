@@ -1,10 +1,14 @@
 """Tests for the skill system."""
 
+import asyncio
+import json
+import os
 import pytest
 from pathlib import Path
 import tempfile
 from agent.skills.loader import SkillLoader
 from agent.skills.index import SkillIndex
+from agent.skills.executor import SkillCommandExecutor
 
 
 def test_skill_loading(tmp_path):
@@ -30,10 +34,11 @@ This is a test skill.
     assert "A test skill for testing" in skill.description
 
 
-def test_skill_discovery(tmp_path):
+@pytest.mark.parametrize("n", [1, 3, 50])
+def test_skill_discovery(tmp_path, n):
     """Test that skills are discovered in a directory."""
     # Create multiple skills
-    for i in range(3):
+    for i in range(n):
         skill_dir = tmp_path / f"skill_{i}"
         skill_dir.mkdir()
         (skill_dir / "SKILL.md").write_text(f"""---
@@ -45,7 +50,10 @@ description: Test skill {i}
 """)
     
     skills = SkillLoader.discover(tmp_path)
-    assert len(skills) == 3
+    assert len(skills) == n
+    
+    parallel = SkillLoader.discover_parallel(tmp_path, max_workers=2)
+    assert [s.name for s in parallel] == [s.name for s in skills]
 
 
 def test_skill_index():
@@ -75,3 +83,218 @@ Just content here.
     # Should still load, using directory name as skill name
     assert skill is not None
     assert skill.name == "no_frontmatter"
+
+
+def test_in_process_skill_command(tmp_path):
+    """Test that declared run(argv) subcommands are dispatched without a subprocess."""
+    skill = tmp_path / "echo_skill"
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("""---
+name: echo_skill
+in_process:
+  scripts/echo.py: [a]
+---
+""")
+    (skill / "scripts" / "echo.py").write_text("""
+import json
+import os
+import sys
+
+def run(argv):
+    return {"args": argv, "pid": os.getpid()}
+
+if __name__ == "__main__":
+    print(json.dumps(run(sys.argv[1:])))
+""")
+    
+    executor = SkillCommandExecutor(base_path=tmp_path, allowed_prefixes=["python3"])
+    result = asyncio.run(executor.execute('python3 echo_skill/scripts/echo.py a "b c"'))
+    
+    assert result.success
+    data = json.loads(result.stdout)
+    assert data["args"] == ["a", "b c"]
+    assert data["pid"] == os.getpid()
+    
+    # Undeclared subcommands still get a subprocess
+    result = asyncio.run(executor.execute("python3 echo_skill/scripts/echo.py b"))
+    assert json.loads(result.stdout)["pid"] != os.getpid()
+
+
+def test_in_process_requires_declaration(tmp_path):
+    """Test that a script defining run() is not imported unless SKILL.md lists it."""
+    skill = tmp_path / "plain_skill"
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: plain_skill\n---\n")
+    (skill / "scripts" / "tool.py").write_text("""
+import os
+
+def run(argv):
+    return {"pid": os.getpid()}
+
+if __name__ == "__main__":
+    print(os.getpid())
+""")
+    
+    executor = SkillCommandExecutor(base_path=tmp_path, allowed_prefixes=["python3"])
+    result = asyncio.run(executor.execute("python3 plain_skill/scripts/tool.py go"))
+    
+    assert result.success
+    assert int(result.stdout) != os.getpid()
+
+
+def test_in_process_script_exit_falls_back(tmp_path):
+    """Test that a run() raising SystemExit is rerun as a subprocess, not fatal."""
+    skill = tmp_path / "exit_skill"
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("""---
+name: exit_skill
+in_process:
+  scripts/quit.py: [now]
+---
+""")
+    (skill / "scripts" / "quit.py").write_text("""
+import sys
+
+def run(argv):
+    sys.exit(2)
+
+if __name__ == "__main__":
+    print("from subprocess")
+    sys.exit(3)
+""")
+    
+    executor = SkillCommandExecutor(base_path=tmp_path, allowed_prefixes=["python3"])
+    result = asyncio.run(executor.execute("python3 exit_skill/scripts/quit.py now"))
+    
+    assert not result.success
+    assert result.return_code == 3
+    assert result.stdout == "from subprocess"
+
+
+@pytest.mark.parametrize("command, message", [
+    ("python3 calculator/scripts/calc.py calc", "required"),
+    ("python3 calculator/scripts/calc.py calc add x --bogus", "unrecognized"),
+])
+def test_in_process_calc_argument_errors(capsys, command, message):
+    """Test that calculator argument errors come back as results, not exits."""
+    skills_path = Path(__file__).parent.parent / "skills"
+    executor = SkillCommandExecutor(base_path=skills_path, allowed_prefixes=["python3"])
+    result = asyncio.run(executor.execute(command))
+    
+    assert not result.success
+    data = json.loads(result.stdout)
+    assert message in data["error"]
+    assert "usage" in data
+    # Nothing leaks onto the host's own streams
+    assert capsys.readouterr() == ("", "")
+
+
+def test_calc_run_without_subcommand():
+    """Test that calc.py's run() reports a missing subcommand instead of exiting."""
+    skills_path = Path(__file__).parent.parent / "skills"
+    executor = SkillCommandExecutor(base_path=skills_path, allowed_prefixes=["python3"])
+    script = executor._load_script(skills_path / "calculator" / "scripts" / "calc.py")
+    
+    data = script.run([])
+    assert data["error"] == "No subcommand given"
+    assert "usage" in data
+
+
+def test_runaway_expr_times_out_without_blocking(tmp_path):
+    """Test that a runaway expr is killed at the timeout while the loop keeps running."""
+    skills_path = Path(__file__).parent.parent / "skills"
+    executor = SkillCommandExecutor(base_path=skills_path, allowed_prefixes=["python3"], timeout=1)
+    
+    async def run():
+        loop = asyncio.get_running_loop()
+        max_gap = 0.0
+        
+        async def ticker():
+            nonlocal max_gap
+            last = loop.time()
+            while True:
+                await asyncio.sleep(0.01)
+                now = loop.time()
+                max_gap = max(max_gap, now - last)
+                last = now
+        
+        tick = asyncio.create_task(ticker())
+        start = loop.time()
+        result = await executor.execute('python3 calculator/scripts/calc.py expr "9**9**9"')
+        elapsed = loop.time() - start
+        tick.cancel()
+        return result, elapsed, max_gap
+    
+    result, elapsed, max_gap = asyncio.run(run())
+    assert not result.success
+    assert "timed out" in result.error
+    assert elapsed < 5
+    assert max_gap < 0.5
+
+
+@pytest.mark.parametrize("rows", [10, 1024])
+def test_calc_array_rejects_nested(rows):
+    """Test that nested arrays are rejected below and above the NumPy threshold."""
+    skills_path = Path(__file__).parent.parent / "skills"
+    executor = SkillCommandExecutor(base_path=skills_path, allowed_prefixes=["python3"])
+    data = json.dumps([[1, 2]] * rows)
+    result = asyncio.run(executor.execute(f"python3 calculator/scripts/calc.py array mean '{data}'"))
+    
+    assert not result.success
+    assert json.loads(result.stdout)["error"] == "All array elements must be numbers"
+
+
+def test_skill_index_version(tmp_path):
+    """Test that index mutations bump the version counter."""
+    skill_dir = tmp_path / "versioned"
+    skill_dir.mkdir()
+    (skill_dir / "SKILL.md").write_text("""---
+name: versioned
+description: Versioned skill
+---
+""")
+    
+    index = SkillIndex(str(tmp_path))
+    start = index.version
+    
+    index.discover()
+    assert index.version > start
+    summaries = index.get_summaries_json()
+    assert json.loads(summaries) == [{"name": "versioned", "description": "Versioned skill"}]
+    assert index.get_summaries_json() is summaries
+    
+    discovered = index.version
+    assert index.unregister("versioned")
+    assert index.version > discovered
+    assert index.get_summaries_json() == "[]"
+    
+    unchanged = index.version
+    assert not index.unregister("missing")
+    assert index.version == unchanged
+
+
+def test_skill_loader_cache(tmp_path):
+    """Test that unchanged skills are reused and edited ones reparsed."""
+    skill_dir = tmp_path / "cached"
+    skill_dir.mkdir()
+    skill_md = skill_dir / "SKILL.md"
+    skill_md.write_text("""---
+name: cached
+description: First
+---
+""")
+    
+    first = SkillLoader.load(skill_dir)
+    assert SkillLoader.load(skill_dir) is first
+    
+    skill_md.write_text("""---
+name: cached
+description: Second version
+---
+""")
+    st = skill_md.stat()
+    os.utime(skill_md, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    
+    second = SkillLoader.load(skill_dir)
+    assert second is not first
+    assert second.description == "Second version"
@@ -1,6 +1,9 @@
 """Tests for the tool system."""
 
+import asyncio
 import pytest
+from agent.llm.base import ToolCall
+from agent.tools.executor import ToolExecutor
 from agent.tools.registry import ToolRegistry
 from agent.tools.schema import function_to_schema
 
@@ -63,8 +66,82 @@ def test_tool_disable():
     
     assert "disable_test" in registry.list_names()
     
+    assert registry.names_str() == "disable_test"
+    
     registry.disable("disable_test")
     assert "disable_test" not in registry.list_names()
+    assert registry.names_str() == ""
     
     registry.enable("disable_test")
     assert "disable_test" in registry.list_names()
+    assert registry.names_str() == "disable_test"
+
+
+def test_execute_parallel():
+    """Test that ToolCall objects are executed and results keep their order."""
+    registry = ToolRegistry()
+    
+    @registry.tool(name="double")
+    def double(x: int) -> int:
+        """Double a number."""
+        return x * 2
+    
+    executor = ToolExecutor(registry)
+    calls = [
+        ToolCall(id="a", name="double", input={"x": 2}),
+        ToolCall(id="b", name="missing", input={}),
+    ]
+    results = asyncio.run(executor.execute_parallel(calls))
+    
+    assert [r.tool_call_id for r in results] == ["a", "b"]
+    assert results[0].success and results[0].result == 4
+    assert not results[1].success
+
+
+def test_tool_listing_by_tag():
+    """Test tag filtering across registration changes."""
+    registry = ToolRegistry()
+    
+    @registry.tool(name="a", tags=["x"])
+    def a(): pass
+    
+    @registry.tool(name="b", tags=["y"])
+    def b(): pass
+    
+    @registry.tool(name="c", tags=["x", "y"])
+    def c(): pass
+    
+    assert [t.name for t in registry.list_tools(tags=["y", "x"])] == ["a", "b", "c"]
+    assert [t.name for t in registry.list_tools(tags=["x"])] == ["a", "c"]
+    assert registry.list_tools(tags=["missing"]) == []
+    
+    registry.disable("c")
+    assert [t.name for t in registry.list_tools(tags=["x"])] == ["a"]
+    
+    registry.unregister("a")
+    registry.register(c, name="c", tags=["y"])
+    assert registry.list_tools(tags=["x"]) == []
+    assert [t.name for t in registry.list_tools(tags=["y"])] == ["b", "c"]
+
+
+def test_execute_parallel_bounded():
+    """Test that max_parallel caps concurrently running tool calls."""
+    registry = ToolRegistry()
+    running = 0
+    peak = 0
+    
+    @registry.tool(name="sleepy")
+    async def sleepy() -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+    
+    executor = ToolExecutor(registry, max_parallel=2)
+    calls = [ToolCall(id=str(i), name="sleepy", input={}) for i in range(6)]
+    results = asyncio.run(executor.execute_parallel(calls))
+    
+    assert all(r.success for r in results)
+    assert peak == 2
@@ -0,0 +1,166 @@
+"""Tests for LLM tracing."""
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from pathlib import Path
+from agent.llm.tracer import LLMTracer, _LazyTracer, _NullTracer
+
+# agent.llm re-exports the global `tracer` instance under the module's name
+tracer_module = importlib.import_module("agent.llm.tracer")
+
+
+class GatedTracer(LLMTracer):
+    """Tracer whose writer thread waits for `gate`, so writes queue up into one batch."""
+
+    def __init__(self, *args, **kwargs):
+        self.gate = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def _writer(self):
+        self.gate.wait()
+        super()._writer()
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_tracer_writes_trace_files(tmp_path):
+    """Test that request, response, stream and tool traces land in their files."""
+    t = LLMTracer(trace_dir=str(tmp_path))
+
+    trace_id = t.trace_request(
+        messages=[{"role": "user", "content": "hi"}],
+        system_prompt="sys",
+        tools=None,
+        model="m"
+    )
+    for i in range(3):
+        t.trace_stream_chunk(trace_id, {"n": i})
+    t.trace_tool_call(trace_id, "adder", {"a": 1}, 2, True, 1.5)
+    t.trace_response(trace_id, "hello", duration_ms=12.0)
+    assert t.flush()
+
+    session = json.loads((t.session_dir / "session.json").read_text())
+    assert session["session_id"] == t.session_id
+
+    request = json.loads((t.session_dir / f"{trace_id}_request.json").read_text())
+    assert request["model"] == "m"
+    assert request["messages"] == [{"role": "user", "content": "hi"}]
+
+    response = json.loads((t.session_dir / f"{trace_id}_response.json").read_text())
+    assert response["response"] == "hello"
+    assert response["duration_ms"] == 12.0
+
+    stream = read_jsonl(t.session_dir / f"{trace_id}_stream.jsonl")
+    assert [r["chunk"] for r in stream] == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+    tools = read_jsonl(t.session_dir / f"{trace_id}_tools.jsonl")
+    assert tools[0]["tool_name"] == "adder"
+    assert tools[0]["output"] == "2"
+
+
+def test_tracer_coalesces_writes_per_file(tmp_path, monkeypatch):
+    """Test that one batch opens each file once and keeps truncate/append order."""
+    opened = []
+    real_open = open
+
+    def counting_open(path, mode, *args, **kwargs):
+        opened.append((path.name, mode))
+        return real_open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(tracer_module, "open", counting_open, raising=False)
+    t = GatedTracer(trace_dir=str(tmp_path))
+
+    log = t.session_dir / "log.jsonl"
+    for i in range(5):
+        t._write(log, f"{i}\n".encode(), append=True)
+
+    # A truncating write followed by appends to the same path in one batch
+    out = t.session_dir / "out.json"
+    t._write(out, b"old", append=True)
+    t._write(out, b"new")
+    t._write(out, b"+more", append=True)
+
+    t.gate.set()
+    assert t.flush()
+
+    assert log.read_text() == "0\n1\n2\n3\n4\n"
+    assert out.read_text() == "new+more"
+    assert sorted(opened) == [("log.jsonl", "ab"), ("out.json", "wb"), ("session.json", "wb")]
+
+
+def test_tracer_flush_waits_for_queued_writes(tmp_path):
+    """Test that flush() only returns once earlier writes are on disk."""
+    t = GatedTracer(trace_dir=str(tmp_path))
+    path = t.session_dir / "late.txt"
+    t._write(path, b"data")
+
+    # The writer is held, so the flush event can't be reached yet
+    assert not t.flush(timeout=0.05)
+    assert not path.exists()
+
+    t.gate.set()
+    assert t.flush()
+    assert path.read_bytes() == b"data"
+
+
+def test_tracer_registers_atexit_flush(tmp_path, monkeypatch):
+    """Test that pending traces are flushed at interpreter exit."""
+    registered = []
+    monkeypatch.setattr(tracer_module.atexit, "register", registered.append)
+
+    t = GatedTracer(trace_dir=str(tmp_path))
+    assert registered == [t.flush]
+
+    path = t.session_dir / "pending.txt"
+    t._write(path, b"data")
+    t.gate.set()
+    for hook in registered:
+        assert hook()
+    assert path.read_bytes() == b"data"
+
+
+def test_import_creates_no_trace_dir(tmp_path):
+    """Test that importing the package doesn't construct the tracer."""
+    src = Path(__file__).parent.parent / "src"
+    subprocess.run(
+        [sys.executable, "-c", "import agent, agent.llm"],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(src)},
+        check=True
+    )
+    assert not (tmp_path / "llm_traces").exists()
+
+
+def test_lazy_tracer_constructs_on_first_use(tmp_path, monkeypatch):
+    """Test that the real tracer is built on the first trace call."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("AGENT_TRACE", raising=False)
+    lazy = _LazyTracer()
+    assert not (tmp_path / "llm_traces").exists()
+
+    trace_id = lazy.trace_request(messages=[], system_prompt=None, tools=None, model="m")
+    assert trace_id
+    assert lazy.flush()
+    assert isinstance(lazy._real, LLMTracer)
+    assert (lazy._real.session_dir / f"{trace_id}_request.json").exists()
+
+
+def test_tracing_disabled(tmp_path, monkeypatch):
+    """Test that AGENT_TRACE=0 gives a no-op tracer that creates nothing."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AGENT_TRACE", "0")
+    lazy = _LazyTracer()
+
+    assert lazy.trace_request(messages=[], system_prompt=None, tools=None, model="m") == ""
+    lazy.trace_stream_chunk("", {"n": 1})
+    lazy.trace_response("", "hello", duration_ms=1.0)
+    assert lazy.flush()
+    assert isinstance(lazy._real, _NullTracer)
+    assert list(tmp_path.iterdir()) == []